@@ -6,18 +6,19 @@ from sqlalchemy import pool
 from alembic import context
 
 # Import settings
-from app.core.config import Settings
+from app.core.config import get_settings
 
 # Import Base and all models
 from app.api.Dependences import Base
 from app.api.v1.user.models import User  # Import all your models here
+from app.api.v1.auth.models import LoginEvent, RefreshToken, RevokedToken
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
 # Build sync database URL for Alembic (not async)
-settings = Settings()
+settings = get_settings()
 DATABASE_URL = (
     f"postgresql://{settings.DATABASE_USER}:"
     f"{settings.DATABASE_PASSWORD}@"
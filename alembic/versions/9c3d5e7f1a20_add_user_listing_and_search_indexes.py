@@ -0,0 +1,53 @@
+"""add user listing and search indexes
+
+Revision ID: 9c3d5e7f1a20
+Revises: 4e8a1c2d9b31
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3d5e7f1a20'
+down_revision: Union[str, Sequence[str], None] = '4e8a1c2d9b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name -> (expression, index method)
+SEARCH_INDEXES = {
+    # Keyset pagination by newest/oldest first
+    'ix_users_created_at_id': ('created_at, id', None),
+    # Case-insensitive prefix search: lower(col) LIKE 'term%'
+    'ix_users_username_lower_prefix': ('lower(username) text_pattern_ops', None),
+    'ix_users_email_lower_prefix': ('lower(email) text_pattern_ops', None),
+    # Substring search: lower(col) LIKE '%term%'
+    'ix_users_username_lower_trgm': ('lower(username) gin_trgm_ops', 'gin'),
+    'ix_users_email_lower_trgm': ('lower(email) gin_trgm_ops', 'gin'),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CONCURRENTLY can't run inside a transaction, and doesn't block writes to the table
+    with op.get_context().autocommit_block():
+        for name, (expression, using) in SEARCH_INDEXES.items():
+            # A failed concurrent build leaves an INVALID index behind; clear it so a re-run rebuilds
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
+            op.create_index(
+                name, 'users', [sa.text(expression)],
+                postgresql_using=using, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in reversed(list(SEARCH_INDEXES)):
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
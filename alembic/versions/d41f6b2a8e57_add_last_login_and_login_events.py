@@ -0,0 +1,45 @@
+"""add last login and login events
+
+Revision ID: d41f6b2a8e57
+Revises: 9c3d5e7f1a20
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f6b2a8e57'
+down_revision: Union[str, Sequence[str], None] = '9c3d5e7f1a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable with no default, so adding it doesn't rewrite the table
+    op.add_column('users', sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.create_table(
+        'login_events',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('event', sa.String(length=32), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.String(length=256), nullable=True),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_login_events_user_id_occurred_at', 'login_events', ['user_id', 'occurred_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_login_events_user_id_occurred_at', table_name='login_events')
+    op.drop_table('login_events')
+    op.drop_column('users', 'last_login_at')
@@ -0,0 +1,65 @@
+"""add case-insensitive unique covering login indexes
+
+Revision ID: e5a7c3f9b104
+Revises: d41f6b2a8e57
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c3f9b104'
+down_revision: Union[str, Sequence[str], None] = 'd41f6b2a8e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Everything the login projection selects, so lower(col) = :value is an index-only scan
+LOGIN_COLUMNS = ['id', 'username', 'email', 'hashed_password']
+LOGIN_INDEXES = {
+    'ix_users_email_lower_login': 'lower(email)',
+    'ix_users_username_lower_login': 'lower(username)',
+}
+
+
+def assert_no_case_duplicates() -> None:
+    """Refuse to upgrade while accounts differ only in the case of an email or username
+
+    Which of them should keep the address is an operator decision, so they
+    are reported rather than merged here.
+    """
+    bind = op.get_bind()
+    for expression in LOGIN_INDEXES.values():
+        duplicates = bind.execute(sa.text(
+            f'SELECT {expression} FROM users GROUP BY 1 HAVING count(*) > 1 LIMIT 20'
+        )).scalars().all()
+        if duplicates:
+            raise RuntimeError(
+                f'Accounts differ only in case on {expression}: {", ".join(duplicates)}; '
+                f'rename or merge them before upgrading'
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    assert_no_case_duplicates()
+    # CONCURRENTLY can't run inside a transaction, and doesn't block writes to the table
+    with op.get_context().autocommit_block():
+        for name, expression in LOGIN_INDEXES.items():
+            # A failed concurrent build leaves an INVALID index behind; clear it so a re-run rebuilds
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
+            # Unique, so "Alice@x.com" and "alice@x.com" can't both register
+            op.create_index(
+                name, 'users', [sa.text(expression)], unique=True,
+                postgresql_include=LOGIN_COLUMNS, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in reversed(list(LOGIN_INDEXES)):
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,33 @@
+"""add users is_admin
+
+Revision ID: f3c9a1d7e2b6
+Revises: e5a7c3f9b104
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a1d7e2b6'
+down_revision: Union[str, Sequence[str], None] = 'e5a7c3f9b104'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default is a catalog-only change on Postgres 11+, so no table rewrite
+    op.add_column(
+        'users',
+        sa.Column('is_admin', sa.Boolean(), server_default=sa.false(), nullable=False)
+    )
+    # No existing account is promoted here; admins are granted with set_admin.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'is_admin')
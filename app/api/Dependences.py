@@ -1,6 +1,8 @@
 from typing import AsyncGenerator
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import AsyncSessionLocal
+from app.core.database import AsyncSessionLocal, ReadSessionLocal
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -18,6 +20,38 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Database session dependency for read-mostly work
+
+    SELECTs go to a read replica when any are configured; once the session
+    writes, it is pinned to the primary for the rest of the request.
+    """
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+async def require_admin(request: Request, db: AsyncSession = Depends(get_db)) -> dict:
+    """Admin-only endpoint guard; AuthorizeMiddleware has already verified the token"""
+    from app.api.v1.user.models import User
+    payload = getattr(request.state, "token_payload", None)
+    if not payload or payload.get("user_id") is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    # Looked up per request rather than carried in the token, and on the primary
+    # rather than a lagging replica, so revoking admin takes effect at once
+    result = await db.execute(select(User.is_admin).where(User.id == payload["user_id"]))
+    if not result.scalar():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return payload
+
+
 async def get_auth_service(db: AsyncSession):
     """AuthService dependency"""
     from app.api.v1.auth.services import AuthService
@@ -0,0 +1,76 @@
+"""
+Login audit events
+Recorded through a write-behind buffer so a login never waits on these
+writes; each flush is one multi-row INSERT plus one batched last_login_at UPDATE
+"""
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import bindparam, insert, or_, update
+from app.api.v1.auth.models import LoginEvent
+from app.api.v1.user.models import User
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.write_behind import WriteBehindBuffer
+
+LOGIN_SUCCEEDED = "login"
+LOGIN_FAILED = "login_failed"
+TOKEN_REFRESHED = "refresh"
+LOGGED_OUT = "logout"
+
+# Never moves last_login_at backwards when batches land out of order, and
+# leaves updated_at alone since a login is not a profile change
+_last_login_update = (
+    update(User.__table__)
+    .where(
+        User.id == bindparam("b_user_id"),
+        or_(User.last_login_at.is_(None), User.last_login_at < bindparam("b_occurred_at"))
+    )
+    .values(last_login_at=bindparam("b_occurred_at"), updated_at=User.updated_at)
+)
+
+
+async def flush_login_events(events: list[dict]):
+    """Write one batch of events and the latest login time per user"""
+    latest_logins = {}
+    for event in events:
+        if event["event"] == LOGIN_SUCCEEDED and event["user_id"] is not None:
+            previous = latest_logins.get(event["user_id"])
+            if previous is None or previous < event["occurred_at"]:
+                latest_logins[event["user_id"]] = event["occurred_at"]
+    
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(LoginEvent).values(events))
+        if latest_logins:
+            await session.execute(_last_login_update, [
+                {"b_user_id": user_id, "b_occurred_at": occurred_at}
+                for user_id, occurred_at in latest_logins.items()
+            ])
+        await session.commit()
+
+
+login_events = WriteBehindBuffer(
+    flush_login_events,
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_SECONDS,
+    overflow=settings.AUDIT_OVERFLOW,
+    spill_path=settings.AUDIT_SPILL_PATH
+)
+
+
+def record_event(
+    event: str,
+    user_id: Optional[int] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None
+):
+    """Queue an audit event; never blocks and never raises into the request"""
+    if not settings.AUDIT_EVENTS_ENABLED:
+        return
+    login_events.submit({
+        "user_id": user_id,
+        "event": event,
+        "ip_address": ip_address,
+        "user_agent": user_agent[:256] if user_agent else None,
+        "occurred_at": datetime.now(timezone.utc),
+    })
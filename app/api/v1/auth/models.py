@@ -0,0 +1,45 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String
+from app.api.Dependences import Base
+from app.api.v1.user.models import TimeStampMixin
+
+
+class RefreshToken(Base, TimeStampMixin):
+    """Refresh token; only the SHA-256 of the opaque token is stored"""
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    # Every rotation of one login shares a family so token reuse can revoke the whole chain
+    family_id = Column(String(32), index=True, nullable=False)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class RevokedToken(Base, TimeStampMixin):
+    """Revoked access token id, kept until the token would have expired anyway"""
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        # Periodic sync reads revocations newer than its last watermark
+        Index("ix_revoked_tokens_created_at", "created_at"),
+    )
+
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class LoginEvent(Base):
+    """Append-only audit trail of logins, refreshes and logouts"""
+    __tablename__ = "login_events"
+    __table_args__ = (
+        Index("ix_login_events_user_id_occurred_at", "user_id", "occurred_at"),
+    )
+
+    # SQLite only auto-increments INTEGER keys (used by the local benchmarks)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    # No foreign key: failed attempts may name no user, and inserts stay cheap
+    user_id = Column(Integer, nullable=True)
+    event = Column(String(32), nullable=False)
+    ip_address = Column(String(45), nullable=True)
+    user_agent = Column(String(256), nullable=True)
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
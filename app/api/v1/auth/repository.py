@@ -1,4 +1,7 @@
-from sqlalchemy import select
+from datetime import datetime, timezone
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.api.v1.auth.models import RefreshToken, RevokedToken
 from app.api.v1.user.models import User
 class AuthRepository:
     def __init__(self, db_session):
@@ -8,4 +11,65 @@ class AuthRepository:
         result = await self.db_session.execute(
             select(User).where(User.email == email, User.hashed_password == hashed_password)
         )
-        return result.scalars().first()
\ No newline at end of file
+        return result.scalars().first()
+
+    async def create_refresh_token(self, user_id: int, family_id: str, token_hash: str, expires_at: datetime):
+        """Store a refresh token hash"""
+        await self.db_session.execute(
+            insert(RefreshToken).values(
+                user_id=user_id,
+                family_id=family_id,
+                token_hash=token_hash,
+                expires_at=expires_at
+            )
+        )
+
+    async def consume_refresh_token(self, token_hash: str):
+        """Atomically revoke a live refresh token; returns (user_id, family_id) or None"""
+        now = datetime.now(timezone.utc)
+        result = await self.db_session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now
+            )
+            .values(revoked_at=now)
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+        )
+        return result.first()
+
+    async def get_refresh_token_family(self, token_hash: str):
+        """Family id of a refresh token regardless of state, or None if unknown"""
+        result = await self.db_session.execute(
+            select(RefreshToken.family_id).where(RefreshToken.token_hash == token_hash)
+        )
+        return result.scalar()
+
+    async def revoke_refresh_family(self, family_id: str):
+        """Revoke every live refresh token of a login"""
+        await self.db_session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+
+    async def add_revoked_token(self, jti: str, expires_at: datetime):
+        """Record a revoked access token id; revoking one twice is not an error"""
+        # Two logouts with the same token can both get here (concurrently, or on
+        # different workers before their next sync)
+        await self.db_session.execute(
+            pg_insert(RevokedToken)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["jti"])
+        )
+
+    async def get_revoked_tokens(self, since: datetime = None) -> list:
+        """Unexpired revocations, optionally only those recorded since a timestamp"""
+        query = select(RevokedToken.jti, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > datetime.now(timezone.utc)
+        )
+        if since is not None:
+            query = query.where(RevokedToken.created_at >= since)
+        result = await self.db_session.execute(query)
+        return result.all()
@@ -1,8 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.v1.auth.services import AuthService
-from app.api.v1.auth.schemas import SignInResponseSchema, SignInSchema, SignUpSchema, SignUpResponseSchema
-from app.api.Dependences import get_db
+from app.api.v1.auth.schemas import (
+    LogoutSchema, RefreshTokenSchema, SignInResponseSchema, SignInSchema, SignUpSchema, SignUpResponseSchema
+)
+from app.api.Dependences import get_db, get_read_db
+from app.api.v1.user.repository import UserAlreadyExistsError
+from app.core.hashing import HashingQueueFullError
+from app.core.rate_limit import login_identifier_limiter, login_ip_limiter
+from app.core.security import verify_token
+from app.core.token_cache import token_cache
+from app.core.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
 
 auth_router = APIRouter(
     prefix="/auth",
@@ -10,15 +22,50 @@ auth_router = APIRouter(
 )
 
 
+def request_auth_service(request: Request, db: AsyncSession) -> AuthService:
+    """AuthService carrying the client details recorded in audit events"""
+    return AuthService(
+        db,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent")
+    )
+
+
+async def enforce_login_rate_limit(request: Request, sign_in_data: SignInSchema):
+    """Reject login attempts over the per-IP or per-identifier budget"""
+    checks = []
+    # Clients without an address (e.g. a unix socket) get no IP bucket rather
+    # than one shared by all of them; the identifier bucket still applies
+    if login_ip_limiter is not None and request.client is not None:
+        checks.append((login_ip_limiter, request.client.host))
+    if login_identifier_limiter is not None:
+        # Global per account, so stuffing one account from many IPs is still limited
+        identifier = (sign_in_data.email or sign_in_data.username or "").lower()
+        checks.append((login_identifier_limiter, identifier))
+    
+    for limiter, key in checks:
+        retry_after = await limiter.hit(key)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please retry later",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+
 @auth_router.post("/login", response_model=SignInResponseSchema)
 async def login(
+    request: Request,
     sign_in_data: SignInSchema,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Login endpoint - can use email or username"""
+    # Runs before any DB or bcrypt work so rejected attempts stay cheap
+    await enforce_login_rate_limit(request, sign_in_data)
+    
     try:
         # Validate that at least email or username is provided (done in schema)
-        auth_service = AuthService(db)
+        auth_service = request_auth_service(request, db)
         result = await auth_service.login_user(sign_in_data)
         
         if not result:
@@ -27,7 +74,14 @@ async def login(
                 detail="Invalid credentials"
             )
         
-        return result
+        # Already a typed model: serialize it once instead of re-validating via response_model
+        return FastJSONResponse(result)
+    except HashingQueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,6 +89,46 @@ async def login(
         )
 
 
+@auth_router.post("/refresh", response_model=SignInResponseSchema)
+async def refresh(
+    request: Request,
+    refresh_data: RefreshTokenSchema,
+    db: AsyncSession = Depends(get_db)
+):
+    """Exchange a refresh token for a new access/refresh token pair"""
+    auth_service = request_auth_service(request, db)
+    result = await auth_service.refresh_tokens(refresh_data.refresh_token)
+    
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+    
+    return FastJSONResponse(result)
+
+
+@auth_router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: Request,
+    logout_data: LogoutSchema,
+    db: AsyncSession = Depends(get_db)
+):
+    """Revoke the current access token and the refresh token's login"""
+    # /auth is public, so the bearer token is not checked by the middleware here
+    payload = None
+    token = request.headers.get("authorization")
+    if token:
+        if token.startswith("Bearer "):
+            token = token[7:]
+        payload = verify_token(token)
+        token_cache.revoke(token)
+    
+    auth_service = request_auth_service(request, db)
+    await auth_service.logout(payload, logout_data.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @auth_router.post("/register", response_model=SignUpResponseSchema)
 async def register(
     user_data: SignUpSchema,
@@ -44,14 +138,28 @@ async def register(
     try:
         auth_service = AuthService(db)
         result = await auth_service.register_user(user_data)
-        return result
+        return FastJSONResponse(result)
+    except UserAlreadyExistsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except HashingQueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
+    except Exception:
+        # Details stay in the log: DB errors echo the statement and its parameters,
+        # password hash included
+        logger.exception("Registration failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred during registration: {str(e)}"
+            detail="An error occurred during registration"
         )
\ No newline at end of file
@@ -1,22 +1,9 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional, Union
-from datetime import datetime
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional
+# Sign-up types belong to the user module, which creates the row; re-exported for the auth router
+from app.api.v1.user.schemas import SignUpResponseSchema, SignUpSchema
 
 
-class SignUpSchema(BaseModel):
-    username: str = Field(..., min_length=3, max_length=50)
-    email: EmailStr
-    password: str = Field(..., min_length=8, max_length=72)
-
-class SignUpResponseSchema(BaseModel):
-    id: int
-    username: str
-    email: EmailStr
-    created_at: datetime
-
-    class Config:
-        from_attributes = True
-
 class SignInSchema(BaseModel):
     email: Optional[str] = None
     username: Optional[str] = None
@@ -41,11 +28,20 @@ class SignInSchema(BaseModel):
             return None
         return v
     
-    def model_post_init(self):
+    @model_validator(mode='after')
+    def validate_identifier(self):
         """Validate that at least one of email or username is provided"""
         if not self.email and not self.username:
             raise ValueError("Either email or username must be provided")
+        return self
 
 class SignInResponseSchema(BaseModel):
     access_token: str
-    token_type: str = "bearer"
\ No newline at end of file
+    refresh_token: Optional[str] = None
+    token_type: str = "bearer"
+
+class RefreshTokenSchema(BaseModel):
+    refresh_token: str = Field(..., min_length=1, max_length=256)
+
+class LogoutSchema(BaseModel):
+    refresh_token: Optional[str] = Field(None, max_length=256)
\ No newline at end of file
@@ -1,47 +1,175 @@
+import hashlib
+import hmac
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.v1.user.services import UserService
+from app.api.v1.user.models import LoginUser
+from app.api.v1.user.repository import UserRepository
 from app.api.v1.auth.repository import AuthRepository
-from app.api.v1.user.schemas import SignInSchema, SignUpSchema, SignInResponseSchema, SignUpResponseSchema
-from app.core.security import verify_password, create_access_token
+from app.api.v1.auth.events import LOGGED_OUT, LOGIN_FAILED, LOGIN_SUCCEEDED, TOKEN_REFRESHED, record_event
+from app.api.v1.auth.schemas import SignInSchema, SignInResponseSchema
+from app.api.v1.user.schemas import SignUpSchema, SignUpResponseSchema
+from app.core.security import REFRESH_TOKEN_EXPIRE_DAYS, create_access_token, hash_refresh_token
+from app.core.database import AsyncSessionLocal, ReadSessionLocal, replica_count
+from app.core.revocation import revocation_store
+from app.core.hashing import password_hasher
+from app.core.metrics import timed
+from app.core.singleflight import SingleFlight
+
+# Shared by every request so concurrent identical logins coalesce
+login_flight = SingleFlight()
+
+# Per-process key so credential digests can't be precomputed or compared across processes
+_credential_digest_key = secrets.token_bytes(32)
+
+
+def credential_digest(user_id: int, hashed_password: str, password: str) -> bytes:
+    """Key for an in-flight credential check; the raw password is never used as a key"""
+    message = f"{user_id}\0{hashed_password}\0{password}".encode("utf-8")
+    return hmac.new(_credential_digest_key, message, hashlib.sha256).digest()
 
 
 class AuthService:
     
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, ip_address: str = None, user_agent: str = None):
         self.db_session = db_session
         self.user_service = UserService(db_session)
         self.auth_repository = AuthRepository(db_session)
+        # Request context for audit events
+        self.ip_address = ip_address
+        self.user_agent = user_agent
+
+    def _record(self, event: str, user_id: Optional[int] = None):
+        record_event(event, user_id=user_id, ip_address=self.ip_address, user_agent=self.user_agent)
 
     async def login_user(self, login_data: SignInSchema) -> SignInResponseSchema:
         """Authenticate user and return access token"""
         # Get user by email or username
-        user = await self.user_service.user_repository.get_user_by_email_or_username(
-            email=login_data.email,
-            username=login_data.username
-        )
+        with timed("db_lookup"):
+            user = await login_flight.do(
+                ("lookup", login_data.email, login_data.username),
+                lambda: load_login_user(login_data.email, login_data.username)
+            )
+        
+        if not user:
+            self._record(LOGIN_FAILED)
+            return None
+        
+        with timed("verify_password"):
+            valid = await login_flight.do(
+                ("verify", credential_digest(user.id, user.hashed_password, login_data.password)),
+                lambda: password_hasher.verify_password(login_data.password, user.hashed_password)
+            )
+        if not valid:
+            self._record(LOGIN_FAILED, user.id)
+            return None
+        
+        tokens = await self._issue_tokens(user)
+        self._record(LOGIN_SUCCEEDED, user.id)
+        return tokens
+
+    async def refresh_tokens(self, refresh_token: str) -> Optional[SignInResponseSchema]:
+        """Rotate a refresh token into a new access/refresh token pair"""
+        token_hash = hash_refresh_token(refresh_token)
+        consumed = await self.auth_repository.consume_refresh_token(token_hash)
+        if consumed is None:
+            family_id = await self.auth_repository.get_refresh_token_family(token_hash)
+            if family_id is not None:
+                # A used or revoked token came back: assume it leaked and end that login everywhere
+                await self.auth_repository.revoke_refresh_family(family_id)
+                await self.db_session.commit()
+            return None
         
-        if not user or not verify_password(login_data.password, user.hashed_password):
+        user_id, family_id = consumed
+        user = await self.user_service.user_repository.get_login_user_by_id(user_id)
+        if user is None:
+            await self.db_session.commit()
             return None
+        tokens = await self._issue_tokens(user, family_id)
+        self._record(TOKEN_REFRESHED, user.id)
+        return tokens
+
+    async def logout(self, access_payload: Optional[dict], refresh_token: Optional[str]):
+        """Revoke the presented access token and the refresh token's whole family"""
+        if refresh_token:
+            family_id = await self.auth_repository.get_refresh_token_family(hash_refresh_token(refresh_token))
+            if family_id is not None:
+                await self.auth_repository.revoke_refresh_family(family_id)
+        
+        jti = access_payload.get("jti") if access_payload else None
+        if jti:
+            expires_at = datetime.fromtimestamp(access_payload["exp"], timezone.utc)
+            await self.auth_repository.add_revoked_token(jti, expires_at)
+            # Effective here immediately; other workers pick it up on their next sync
+            revocation_store.revoke(jti, access_payload["exp"])
         
+        await self.db_session.commit()
+        self._record(LOGGED_OUT, access_payload.get("user_id") if access_payload else None)
+
+    async def _issue_tokens(self, user, family_id: str = None) -> SignInResponseSchema:
         # Create access token with user's email and username
-        access_token = create_access_token(data={
-            "sub": user.email,
-            "username": user.username,
-            "user_id": user.id
-        })
+        with timed("create_access_token"):
+            access_token = create_access_token(data={
+                "sub": user.email,
+                "username": user.username,
+                "user_id": user.id,
+                "jti": uuid.uuid4().hex
+            })
+        
+        refresh_token = secrets.token_urlsafe(32)
+        await self.auth_repository.create_refresh_token(
+            user_id=user.id,
+            family_id=family_id or uuid.uuid4().hex,
+            token_hash=hash_refresh_token(refresh_token),
+            expires_at=datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        )
+        # Commit before responding so the refresh token is usable as soon as the client has it
+        await self.db_session.commit()
         
         return SignInResponseSchema(
             access_token=access_token,
+            refresh_token=refresh_token,
             token_type="bearer"
         )
 
     async def register_user(self, user_data: SignUpSchema) -> SignUpResponseSchema:
         """Register new user"""
-        # Check if user already exists
-        existing_user = await self.user_service.get_user_by_email(user_data.email)
-        if existing_user:
-            raise ValueError("User with this email already exists")
-        
-        # Create new user
+        # Duplicate email/username surfaces as UserAlreadyExistsError from the insert
         result = await self.user_service.user_repository.create_user(user_data)
-        return result
\ No newline at end of file
+        return result
+
+
+async def load_login_user(email: Optional[str], username: Optional[str]) -> Optional[LoginUser]:
+    """Login lookup on its own short-lived session
+
+    Coalesced lookups are shared by every waiting request, so they must not
+    run on any one request's session: that session is rolled back and closed
+    if its client disconnects while the others are still waiting.
+
+    Reads go to a replica when configured. A replica can lag behind a
+    registration on the primary, so a miss there is never cached and is
+    re-checked on the primary before the login is refused.
+    """
+    has_replicas = replica_count() > 0
+    async with ReadSessionLocal() as session:
+        user = await UserRepository(session).get_login_user(
+            email=email, username=username, cache_negative=not has_replicas
+        )
+    if user is None and has_replicas:
+        async with AsyncSessionLocal() as session:
+            user = await UserRepository(session).get_login_user(email=email, username=username)
+    return user
+
+
+async def load_revoked_tokens(since: Optional[float]) -> list[tuple[str, float]]:
+    """Revocation store loader: revocations recorded since the last sync, from the primary"""
+    since_dt = None
+    if since is not None:
+        # Overlap the previous window so clock skew between workers can't drop entries
+        since_dt = datetime.fromtimestamp(since - 60, timezone.utc)
+    async with AsyncSessionLocal() as session:
+        rows = await AuthRepository(session).get_revoked_tokens(since_dt)
+    return [(jti, expires_at.timestamp()) for jti, expires_at in rows]
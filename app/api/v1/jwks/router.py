@@ -0,0 +1,28 @@
+import json
+from fastapi import APIRouter, Response
+from app.core.security import get_token_codec
+
+jwks_router = APIRouter(
+    tags=["Authentication"],
+)
+
+# Keys only change on restart, so the document is serialized once, on first request
+_jwks_body = None
+
+
+def _get_jwks_body() -> bytes:
+    global _jwks_body
+    if _jwks_body is None:
+        keyring = getattr(get_token_codec(), "keyring", None)
+        _jwks_body = json.dumps(keyring.jwks() if keyring else {"keys": []}).encode("utf-8")
+    return _jwks_body
+
+
+@jwks_router.get("/.well-known/jwks.json")
+async def jwks():
+    """Public signing keys for verifying access tokens offline"""
+    return Response(
+        content=_get_jwks_body(),
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=300"}
+    )
@@ -0,0 +1,81 @@
+from functools import partial
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import registry
+from app.core.config import settings
+from app.core.database import pool_stats, replica_count, replica_pool_stats
+from app.core.hashing import password_hasher
+from app.core.token_cache import token_cache
+from app.core.revocation import revocation_store
+from app.core.sql_profiler import sql_profiler
+from app.api.v1.user.cache import user_cache
+from app.api.v1.auth.services import login_flight
+from app.api.v1.auth.events import login_events
+from app.core.traffic_capture import traffic_capture
+from app.core.rate_limit import MemoryRateLimiter, login_identifier_limiter, login_ip_limiter
+
+metrics_router = APIRouter(
+    tags=["Metrics"],
+)
+
+# Monotonic totals in each stats() dict; everything else is a point-in-time gauge
+POOL_COUNTERS = ("waits", "wait_seconds")
+WRITE_BEHIND_COUNTERS = ("submitted", "written", "batches", "dropped", "spilled", "failed")
+RATE_LIMIT_COUNTERS = ("rejected", "evictions")
+
+registry.register_stats("db_pool", "Database connection pool state", pool_stats, POOL_COUNTERS)
+for index in range(replica_count()):
+    registry.register_stats(
+        f"db_replica{index}_pool", "Read replica connection pool state",
+        partial(replica_pool_stats, index), POOL_COUNTERS
+    )
+registry.register_stats(
+    "password_hash_pool", "Password hashing pool queue state", password_hasher.stats,
+    ("submitted", "rejected")
+)
+registry.register_stats(
+    "token_cache", "Verified token cache state", token_cache.stats,
+    ("hits", "misses", "evictions")
+)
+registry.register_stats(
+    "token_revocation", "Revoked access token store state", revocation_store.stats,
+    ("checks", "bloom_hits", "purges")
+)
+registry.register_stats(
+    "user_cache", "User lookup cache state", user_cache.stats,
+    ("hits", "negative_hits", "misses", "errors")
+)
+if settings.SQL_PROFILER_ENABLED:
+    registry.register_stats(
+        "sql_profiler", "Profiled and flagged requests", sql_profiler.stats,
+        ("profiled", "flagged")
+    )
+registry.register_stats(
+    "login_events", "Write-behind login audit event buffer", login_events.stats, WRITE_BEHIND_COUNTERS
+)
+if settings.TRAFFIC_CAPTURE_ENABLED:
+    registry.register_stats(
+        "traffic_capture", "Write-behind traffic capture buffer", traffic_capture.stats, WRITE_BEHIND_COUNTERS
+    )
+registry.register_stats(
+    "login_singleflight", "Coalesced login lookups and credential checks", login_flight.stats,
+    ("leaders", "shared")
+)
+if isinstance(login_ip_limiter, MemoryRateLimiter):
+    registry.register_stats(
+        "login_ip_rate_limit", "Per-IP login rate limiter state", login_ip_limiter.stats, RATE_LIMIT_COUNTERS
+    )
+if isinstance(login_identifier_limiter, MemoryRateLimiter):
+    registry.register_stats(
+        "login_identifier_rate_limit", "Per-identifier login rate limiter state",
+        login_identifier_limiter.stats, RATE_LIMIT_COUNTERS
+    )
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,147 @@
+"""
+Read-through cache for user lookups by email, username and id
+"""
+import json
+import logging
+from typing import Awaitable, Callable, Optional
+
+from app.api.v1.user.models import LoginUser
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stored for lookups that found nothing so repeated misses skip the DB too
+NEGATIVE = "-"
+
+
+# Lowercased like the lookups and unique indexes, so every spelling shares one
+# entry and registering "Bob@x.com" clears a negative entry cached for "bob@x.com"
+def email_key(email: str) -> str:
+    return f"user:email:{email.lower()}"
+
+
+def username_key(username: str) -> str:
+    return f"user:username:{username.lower()}"
+
+
+def id_key(user_id: int) -> str:
+    return f"user:id:{user_id}"
+
+
+class UserCache:
+    """Read-through user cache with TTLs, negative caching and explicit invalidation"""
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: int = 300, negative_ttl: int = 5):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        # Metrics
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get_or_load(
+        self,
+        keys: list[str],
+        loader: Callable[[], Awaitable[Optional[LoginUser]]],
+        cache_negative: bool = True
+    ) -> Optional[LoginUser]:
+        """Return the first cached user found under keys, loading and caching it on a miss
+
+        Pass cache_negative=False when the loader may be behind (a replica), so
+        a "not found" is never remembered on its say-so.
+        """
+        if self.backend is None:
+            return await loader()
+
+        negatives = 0
+        try:
+            for key in keys:
+                cached = await self.backend.get(key)
+                if cached == NEGATIVE:
+                    negatives += 1
+                elif cached is not None:
+                    self.hits += 1
+                    return LoginUser(*json.loads(cached))
+        except Exception as e:
+            # A cache outage must never fail the lookup itself
+            self.errors += 1
+            logger.warning(f"User cache read failed: {str(e)}")
+            return await loader()
+
+        # Every identifier is known not to exist
+        if negatives == len(keys):
+            self.negative_hits += 1
+            return None
+
+        self.misses += 1
+        user = await loader()
+        if user is not None or cache_negative:
+            await self._store(keys, user)
+        return user
+
+    async def _store(self, keys: list[str], user: Optional[LoginUser]):
+        try:
+            if user is None:
+                for key in keys:
+                    await self.backend.set(key, NEGATIVE, self.negative_ttl)
+                return
+
+            value = json.dumps([user.id, user.username, user.email, user.hashed_password])
+            for key in (email_key(user.email), username_key(user.username), id_key(user.id)):
+                await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"User cache write failed: {str(e)}")
+
+    async def invalidate(self, user_id: int = None, email: str = None, username: str = None):
+        """Drop cached entries, including negative ones, for a created or updated user"""
+        if self.backend is None:
+            return
+
+        keys = []
+        if user_id is not None:
+            keys.append(id_key(user_id))
+        if email:
+            keys.append(email_key(email))
+        if username:
+            keys.append(username_key(username))
+
+        await self._delete(keys)
+
+    async def invalidate_many(self, users: list[tuple]):
+        """Drop cached entries for many (id, email, username) rows in one call"""
+        if self.backend is None or not users:
+            return
+
+        keys = []
+        for user_id, email, username in users:
+            keys.extend((id_key(user_id), email_key(email), username_key(username)))
+        await self._delete(keys)
+
+    async def _delete(self, keys: list[str]):
+        try:
+            await self.backend.delete(*keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"User cache invalidation failed: {str(e)}")
+
+    def stats(self) -> dict:
+        """Hit/miss counters"""
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+user_cache = UserCache(
+    create_cache_backend(settings.USER_CACHE_BACKEND),
+    ttl=settings.USER_CACHE_TTL,
+    negative_ttl=settings.USER_CACHE_NEGATIVE_TTL
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Boolean, Column, Index, Integer, String, DateTime, false
 from sqlalchemy.sql import func
 from app.api.Dependences import Base
 
@@ -17,4 +17,53 @@ class User(Base, TimeStampMixin):
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
\ No newline at end of file
+    hashed_password = Column(String, nullable=False)
+    # Gates the admin-only user listing, search and export endpoints
+    is_admin = Column(Boolean, nullable=False, default=False, server_default=false())
+    # Written by the login event buffer, not inline with the login request
+    last_login_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# Listing and search indexes (migration 9c3d5e7f1a20): keyset pagination on
+# (created_at, id), case-insensitive prefix search via text_pattern_ops and
+# substring search via pg_trgm
+Index("ix_users_created_at_id", User.created_at, User.id)
+Index(
+    "ix_users_username_lower_prefix", func.lower(User.username).label("lower_username"),
+    postgresql_ops={"lower_username": "text_pattern_ops"}
+)
+Index(
+    "ix_users_email_lower_prefix", func.lower(User.email).label("lower_email"),
+    postgresql_ops={"lower_email": "text_pattern_ops"}
+)
+Index(
+    "ix_users_username_lower_trgm", func.lower(User.username).label("lower_username"),
+    postgresql_using="gin", postgresql_ops={"lower_username": "gin_trgm_ops"}
+)
+Index(
+    "ix_users_email_lower_trgm", func.lower(User.email).label("lower_email"),
+    postgresql_using="gin", postgresql_ops={"lower_email": "gin_trgm_ops"}
+)
+
+# Case-insensitive login lookup and uniqueness (migration e5a7c3f9b104): lower(col)
+# equality, covering every column LoginUser needs so a single-identifier probe is index-only
+LOGIN_INCLUDE = ["id", "username", "email", "hashed_password"]
+Index(
+    "ix_users_email_lower_login", func.lower(User.email).label("lower_email"),
+    unique=True, postgresql_include=LOGIN_INCLUDE
+)
+Index(
+    "ix_users_username_lower_login", func.lower(User.username).label("lower_username"),
+    unique=True, postgresql_include=LOGIN_INCLUDE
+)
+
+
+class LoginUser:
+    """Lightweight, untracked projection of the columns needed to log a user in"""
+    __slots__ = ("id", "username", "email", "hashed_password")
+
+    def __init__(self, id: int, username: str, email: str, hashed_password: str):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.hashed_password = hashed_password
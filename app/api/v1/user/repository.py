@@ -1,44 +1,176 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.v1.user.schemas import SignUpResponseSchema, SignUpSchema
-from app.api.v1.user.models import User
-from app.core.security import hash_password
+from app.api.v1.user.models import LoginUser, User
+from app.api.v1.user.cache import email_key, id_key, user_cache, username_key
+from app.core.hashing import password_hasher
+from app.core.metrics import timed
+from sqlalchemy import case, func, insert, or_, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 
 
+class UserAlreadyExistsError(ValueError):
+    """Raised when a new user collides with an existing email or username"""
+
+    def __init__(self, field: str):
+        self.field = field
+        super().__init__(f"User with this {field} already exists")
+
+
+# Unique indexes on users and the field each one guards
+UNIQUE_INDEX_FIELDS = {
+    "ix_users_email": "email",
+    "ix_users_username": "username",
+    "ix_users_email_lower_login": "email",
+    "ix_users_username_lower_login": "username",
+}
+
+
+def unique_violation_field(error: IntegrityError):
+    """Return "email" or "username" for a unique violation on that column, else None
+
+    Decided by the violated index's name alone: the message text echoes the
+    submitted values, so a username like "myemail" must not be read as an
+    email conflict.
+    """
+    orig = getattr(error, "orig", None)
+    # asyncpg reports the violated index on the underlying driver exception
+    constraint = getattr(getattr(orig, "__cause__", None), "constraint_name", None)
+    return UNIQUE_INDEX_FIELDS.get(constraint)
+
+
+def email_matches(email: str):
+    """Case-insensitive email equality, served by ix_users_email_lower_login"""
+    return func.lower(User.email) == email.lower()
+
+
+def username_matches(username: str):
+    """Case-insensitive username equality, served by ix_users_username_lower_login"""
+    return func.lower(User.username) == username.lower()
+
+
+def login_user_query(email: str = None, username: str = None):
+    """Single-row, column-projected, case-insensitive lookup by email or username, preferring email"""
+    conditions = []
+    if email:
+        conditions.append(email_matches(email))
+    if username:
+        conditions.append(username_matches(username))
+    if not conditions:
+        return None
+    
+    # Column projection skips the ORM identity map and the unused audit columns.
+    # With one identifier this is an index-only scan of its covering lower() index;
+    # with both it is a BitmapOr that reads the heap, which is why get_login_user
+    # probes them one at a time
+    query = select(
+        User.id, User.username, User.email, User.hashed_password
+    ).where(or_(*conditions))
+    if email and username:
+        # The unique lower() indexes allow one row per identifier, but the two
+        # identifiers may belong to different users
+        query = query.order_by(case((email_matches(email), 0), else_=1))
+    return query.limit(1)
+
+
+def register_user_query(username: str, email: str, hashed_password: str):
+    """Single-statement registration: INSERT ... RETURNING the generated columns"""
+    return (
+        insert(User)
+        .values(username=username, email=email, hashed_password=hashed_password)
+        .returning(User.id, User.created_at)
+    )
+
+
+# Keyset columns for each listing order; a leading "-" means newest/highest first
+USER_SORT_KEYS = {
+    "id": (User.id,),
+    "created_at": (User.created_at, User.id),
+}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def user_search_condition(term: str, field: str = None, match: str = "prefix"):
+    """Case-insensitive prefix or substring match on username and/or email"""
+    pattern = _escape_like(term.lower())
+    pattern = f"{pattern}%" if match == "prefix" else f"%{pattern}%"
+    columns = [User.username, User.email] if field is None else [getattr(User, field)]
+    # lower(col) matches the expression indexes, so both match types are index-backed
+    return or_(*(func.lower(column).like(pattern, escape="\\") for column in columns))
+
+
+def user_page_query(limit: int, sort: str = "id", after: tuple = None, condition=None):
+    """One keyset page (plus one row to detect more) of the listing columns"""
+    descending = sort.startswith("-")
+    key_columns = USER_SORT_KEYS[sort.lstrip("-")]
+    
+    query = select(User.id, User.username, User.email, User.created_at)
+    if condition is not None:
+        query = query.where(condition)
+    if after is not None:
+        # Seek past the last row instead of OFFSET, so deep pages cost the same as the first
+        key = tuple_(*key_columns) if len(key_columns) > 1 else key_columns[0]
+        value = tuple_(*after) if len(key_columns) > 1 else after[0]
+        query = query.where(key < value if descending else key > value)
+    order = [column.desc() if descending else column.asc() for column in key_columns]
+    return query.order_by(*order).limit(limit + 1)
+
+
 class UserRepository:
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
+        self.user_cache = user_cache
 
     async def create_user(self, user_data: SignUpSchema) -> SignUpResponseSchema:
-        """Create a new user with hashed password"""
-        new_user = User(
-            username=user_data.username,
+        """Create a new user with hashed password in a single INSERT ... RETURNING"""
+        with timed("hash_password"):
+            hashed_password = await password_hasher.hash_password(user_data.password)
+        
+        # No pre-check SELECT: the unique indexes decide, which is also race-free
+        try:
+            result = await self.db_session.execute(
+                register_user_query(user_data.username, user_data.email, hashed_password)
+            )
+            user_id, created_at = result.one()
+            # Commit here so the response is never sent for an uncommitted row;
+            # get_db's commit afterwards has no transaction and costs no round trip
+            await self.db_session.commit()
+        except IntegrityError as e:
+            await self.db_session.rollback()
+            field = unique_violation_field(e)
+            if field is None:
+                raise
+            raise UserAlreadyExistsError(field) from e
+        
+        # Clear negative lookups cached before this user existed
+        await self.user_cache.invalidate(
+            user_id=user_id,
             email=user_data.email,
-            hashed_password=hash_password(user_data.password)
+            username=user_data.username
         )
-        self.db_session.add(new_user)
-        await self.db_session.commit()
-        await self.db_session.refresh(new_user)
         
         # Return proper response schema
         return SignUpResponseSchema(
-            id=new_user.id,
-            username=new_user.username,
-            email=new_user.email,
-            created_at=new_user.created_at
+            id=user_id,
+            username=user_data.username,
+            email=user_data.email,
+            created_at=created_at
         )
     
     async def get_user_by_email(self, email: str) -> User:
         """Get user by email address"""
         result = await self.db_session.execute(
-            select(User).where(User.email == email)
+            select(User).where(email_matches(email))
         )
         return result.scalars().first()
     
     async def get_user_by_username(self, username: str) -> User:
         """Get user by username"""
         result = await self.db_session.execute(
-            select(User).where(User.username == username)
+            select(User).where(username_matches(username))
         )
         return result.scalars().first()
     
@@ -46,7 +178,7 @@ class UserRepository:
         """Get user by email or username"""
         if email:
             result = await self.db_session.execute(
-                select(User).where(User.email == email)
+                select(User).where(email_matches(email))
             )
             user = result.scalars().first()
             if user:
@@ -54,8 +186,63 @@ class UserRepository:
         
         if username:
             result = await self.db_session.execute(
-                select(User).where(User.username == username)
+                select(User).where(username_matches(username))
             )
             return result.scalars().first()
         
-        return None
\ No newline at end of file
+        return None
+    
+    async def get_login_user(
+        self,
+        email: str = None,
+        username: str = None,
+        cache_negative: bool = True
+    ) -> LoginUser:
+        """Resolve a login identifier, preferring an email match
+
+        Each identifier is probed (and cached) on its own, email first, so a
+        cached username can never answer for a different user than the DB's
+        email-first order would; the username only counts when no user has
+        the email.
+        """
+        if email:
+            query = login_user_query(email=email)
+            user = await self.user_cache.get_or_load(
+                [email_key(email)], lambda: self._fetch_login_user(query), cache_negative
+            )
+            if user is not None or not username:
+                return user
+        if username:
+            query = login_user_query(username=username)
+            return await self.user_cache.get_or_load(
+                [username_key(username)], lambda: self._fetch_login_user(query), cache_negative
+            )
+        return None
+    
+    async def get_login_user_by_id(self, user_id: int) -> LoginUser:
+        """Get the login projection of a user by id"""
+        query = select(
+            User.id, User.username, User.email, User.hashed_password
+        ).where(User.id == user_id)
+        return await self.user_cache.get_or_load([id_key(user_id)], lambda: self._fetch_login_user(query))
+    
+    async def _fetch_login_user(self, query) -> LoginUser:
+        result = await self.db_session.execute(query)
+        row = result.first()
+        if row is None:
+            return None
+        return LoginUser(*row)
+    
+    async def list_users(
+        self,
+        limit: int,
+        sort: str = "id",
+        after: tuple = None,
+        search: str = None,
+        field: str = None,
+        match: str = "prefix"
+    ) -> list:
+        """Rows of (id, username, email, created_at) for one page, plus one lookahead row"""
+        condition = user_search_condition(search, field, match) if search else None
+        result = await self.db_session.execute(user_page_query(limit, sort, after, condition))
+        return result.all()
@@ -0,0 +1,79 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.user.services import UserService
+from app.api.v1.user.schemas import UserPageSchema
+from app.api.Dependences import get_read_db, require_admin
+from app.core.bulk_export import MEDIA_TYPES, stream_users
+from app.core.responses import FastJSONResponse
+
+user_router = APIRouter(
+    prefix="/users",
+    tags=["Users"],
+)
+
+UserSort = Literal["id", "-id", "created_at", "-created_at"]
+
+
+@user_router.get("", response_model=UserPageSchema)
+async def list_users(
+    limit: int = Query(50, ge=1, le=500),
+    sort: UserSort = "id",
+    cursor: Optional[str] = Query(None, max_length=512),
+    db: AsyncSession = Depends(get_read_db),
+    admin: dict = Depends(require_admin)
+):
+    """List users a page at a time; pass next_cursor back to get the following page"""
+    try:
+        page = await UserService(db).list_users(limit=limit, sort=sort, cursor=cursor)
+        return FastJSONResponse(page)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@user_router.get("/search", response_model=UserPageSchema)
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    field: Optional[Literal["username", "email"]] = None,
+    match: Literal["prefix", "substring"] = "prefix",
+    limit: int = Query(50, ge=1, le=500),
+    sort: UserSort = "id",
+    cursor: Optional[str] = Query(None, max_length=512),
+    db: AsyncSession = Depends(get_read_db),
+    admin: dict = Depends(require_admin)
+):
+    """Case-insensitive search on username and/or email, paginated like the listing"""
+    try:
+        page = await UserService(db).list_users(
+            limit=limit,
+            sort=sort,
+            cursor=cursor,
+            search=q,
+            field=field,
+            match=match
+        )
+        return FastJSONResponse(page)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@user_router.get("/export")
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    after_id: Optional[int] = Query(None, ge=0),
+    chunk_size: int = Query(5000, ge=100, le=50000),
+    admin: dict = Depends(require_admin)
+):
+    """Stream every user as NDJSON or CSV; pass after_id to resume an interrupted export"""
+    return StreamingResponse(
+        stream_users(format, after_id=after_id, chunk_size=chunk_size, header=after_id is None),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'}
+    )
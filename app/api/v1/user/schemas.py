@@ -16,10 +16,12 @@ class SignUpResponseSchema(BaseModel):
     class Config:
         from_attributes = True
 
-class SignInSchema(BaseModel):
-    email: EmailStr
-    password: str = Field(..., min_length=8, max_length=72)
+class UserListItemSchema(BaseModel):
+    id: int
+    username: str
+    email: str
+    created_at: datetime
 
-class SignInResponseSchema(BaseModel):
-    access_token: str
-    token_type: str = "bearer"
\ No newline at end of file
+class UserPageSchema(BaseModel):
+    items: List[UserListItemSchema]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,32 @@
+import base64
+import binascii
+import json
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.v1.user.repository import UserRepository
+from app.api.v1.user.repository import USER_SORT_KEYS, UserRepository
+from app.api.v1.user.schemas import UserListItemSchema, UserPageSchema
+
+
+def encode_cursor(sort: str, row) -> str:
+    """Opaque cursor holding the sort order and the last row's keyset values"""
+    values = [row.created_at.isoformat(), row.id] if sort.lstrip("-") == "created_at" else [row.id]
+    raw = json.dumps({"s": sort, "k": values}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    """Keyset values from a cursor; raises ValueError if it is malformed or for another sort"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        values = data["k"]
+        if data["s"] != sort or len(values) != len(USER_SORT_KEYS[sort.lstrip("-")]):
+            raise ValueError
+        if len(values) == 2:
+            return datetime.fromisoformat(values[0]), int(values[1])
+        return (int(values[0]),)
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
 
 
 class UserService:
@@ -10,4 +37,27 @@ class UserService:
 
     async def get_user_by_email(self, email: str):
         """Get user by email"""
-        return await self.user_repository.get_user_by_email(email)
\ No newline at end of file
+        return await self.user_repository.get_user_by_email(email)
+
+    async def list_users(
+        self,
+        limit: int = 50,
+        sort: str = "id",
+        cursor: str = None,
+        search: str = None,
+        field: str = None,
+        match: str = "prefix"
+    ) -> UserPageSchema:
+        """One page of users, optionally filtered by a search term"""
+        if search and match == "substring" and len(search) < 3:
+            # Trigram indexes can't narrow shorter terms, so they would scan every row
+            raise ValueError("Substring search needs at least 3 characters")
+        
+        after = decode_cursor(cursor, sort) if cursor else None
+        rows = await self.user_repository.list_users(limit, sort, after, search, field, match)
+        
+        next_cursor = encode_cursor(sort, rows[limit - 1]) if len(rows) > limit else None
+        return UserPageSchema(
+            items=[UserListItemSchema(**row._mapping) for row in rows[:limit]],
+            next_cursor=next_cursor
+        )
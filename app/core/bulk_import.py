@@ -0,0 +1,250 @@
+"""
+Bulk user import
+Hashes passwords across all cores and streams rows into Postgres with COPY
+"""
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from app.api.v1.user.cache import user_cache
+from app.api.v1.user.models import User
+from app.api.v1.user.schemas import SignUpSchema
+from app.core.database import get_engine
+from app.core.security import hash_password
+
+logger = logging.getLogger(__name__)
+
+IMPORT_COLUMNS = ["username", "email", "hashed_password", "created_by"]
+# Returned for every row written, so its cache entries can be dropped
+RETURNING = " RETURNING id, email, username"
+
+
+@dataclass
+class ImportReport:
+    """Counters for a bulk import run"""
+    read: int = 0
+    invalid: int = 0
+    written: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+def read_rows(path: str, file_format: str = None) -> Iterator[dict]:
+    """Yield raw rows from a CSV or NDJSON file"""
+    if file_format is None:
+        file_format = "csv" if path.endswith(".csv") else "ndjson"
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+        elif file_format == "ndjson":
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Unknown import format: {file_format}")
+
+
+def _hash_chunk(passwords: list[str]) -> list[str]:
+    """Hash a chunk of passwords inside a worker process"""
+    return [hash_password(password) for password in passwords]
+
+
+async def _hash_batch(pool: ProcessPoolExecutor, workers: int, passwords: list[str]) -> list[str]:
+    loop = asyncio.get_running_loop()
+    chunk_size = max(1, -(-len(passwords) // workers))
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    results = await asyncio.gather(*(loop.run_in_executor(pool, _hash_chunk, chunk) for chunk in chunks))
+    return [hashed for chunk in results for hashed in chunk]
+
+
+def _insert_statement(on_conflict: str) -> str:
+    table = User.__table__.name
+    columns = ", ".join(IMPORT_COLUMNS)
+    if on_conflict == "skip":
+        return (
+            f"INSERT INTO {table} ({columns}) "
+            f"SELECT {columns} FROM users_import "
+            f"ON CONFLICT DO NOTHING"
+            f"{RETURNING}"
+        )
+    if on_conflict == "upsert":
+        # Batches are already unique by email and username (dedupe_batch); rows whose
+        # username belongs to another account are left out and counted as skipped.
+        # Both comparisons ignore case, like the unique lower() indexes.
+        return (
+            f"INSERT INTO {table} ({columns}) "
+            f"SELECT {columns} FROM users_import i "
+            f"WHERE NOT EXISTS ("
+            f"SELECT 1 FROM {table} u "
+            f"WHERE lower(u.username) = lower(i.username) AND lower(u.email) <> lower(i.email)"
+            f") "
+            f"ON CONFLICT (lower(email)) DO UPDATE SET "
+            f"username = EXCLUDED.username, "
+            f"hashed_password = EXCLUDED.hashed_password, "
+            f"updated_at = now(), "
+            f"updated_by = EXCLUDED.created_by"
+            f"{RETURNING}"
+        )
+    raise ValueError(f"Unknown conflict mode: {on_conflict}")
+
+
+def _overwritten_statement() -> str:
+    """Existing rows an upsert batch will update, with the username they had before"""
+    table = User.__table__.name
+    return (
+        f"SELECT u.id, u.email, u.username FROM {table} u "
+        f"JOIN users_import i ON lower(u.email) = lower(i.email)"
+    )
+
+
+def dedupe_batch(records: list[tuple]) -> list[tuple]:
+    """Keep only the last record for each email and each username, ignoring case, in order
+
+    ON CONFLICT (lower(email)) only covers email; two rows sharing a username
+    would otherwise abort the whole statement on ix_users_username_lower_login.
+    """
+    emails, usernames = set(), set()
+    kept = []
+    for record in reversed(records):
+        username, email = record[:2]
+        username, email = username.lower(), email.lower()
+        if email in emails or username in usernames:
+            continue
+        emails.add(email)
+        usernames.add(username)
+        kept.append(record)
+    kept.reverse()
+    return kept
+
+
+async def _copy_batch(
+    driver_connection,
+    records: list[tuple],
+    insert_sql: str,
+    overwritten_sql: str = None
+) -> tuple[int, list]:
+    """COPY one batch into a temp table and merge it into users
+
+    Returns the number of rows written and the (id, email, username) of every
+    user whose cached entries are now stale.
+    """
+    async with driver_connection.transaction():
+        await driver_connection.execute(
+            "CREATE TEMP TABLE users_import ("
+            "username text, email text, hashed_password text, created_by text"
+            ") ON COMMIT DROP"
+        )
+        await driver_connection.copy_records_to_table(
+            "users_import",
+            records=records,
+            columns=IMPORT_COLUMNS
+        )
+        stale = await driver_connection.fetch(overwritten_sql) if overwritten_sql else []
+        written = await driver_connection.fetch(insert_sql)
+    return len(written), [tuple(row) for row in (*stale, *written)]
+
+
+async def import_users(
+    rows: Iterator[dict],
+    batch_size: int = 5000,
+    on_conflict: str = "skip",
+    workers: int = None,
+    created_by: str = "bulk-import"
+) -> ImportReport:
+    """Validate, hash and COPY users into the database in batches"""
+    workers = workers or os.cpu_count() or 1
+    insert_sql = _insert_statement(on_conflict)
+    # Skip mode's bare ON CONFLICT DO NOTHING already tolerates repeats within a batch
+    # and never changes an existing row
+    dedupe = on_conflict == "upsert"
+    overwritten_sql = _overwritten_statement() if on_conflict == "upsert" else None
+    report = ImportReport()
+
+    def batches() -> Iterator[list[SignUpSchema]]:
+        batch = []
+        for row in rows:
+            report.read += 1
+            try:
+                batch.append(SignUpSchema(**row))
+            except ValidationError as e:
+                report.invalid += 1
+                # Field locations only: the error text echoes input values, passwords included
+                fields = [err["loc"] for err in e.errors(include_input=False)]
+                logger.warning(f"Skipping invalid row {report.read}: invalid fields {fields}")
+                continue
+            except TypeError:
+                report.invalid += 1
+                logger.warning(f"Skipping invalid row {report.read}: not a mapping of fields")
+                continue
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        async with get_engine().connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver_connection = raw.driver_connection
+
+            pending = None
+            for batch in batches():
+                # Hash the next batch while the previous one is being copied
+                hashing = asyncio.ensure_future(
+                    _hash_batch(pool, workers, [user.password for user in batch])
+                )
+                if pending is not None:
+                    await _write(driver_connection, insert_sql, overwritten_sql, *pending, report, dedupe)
+                pending = (batch, await hashing, created_by)
+            if pending is not None:
+                await _write(driver_connection, insert_sql, overwritten_sql, *pending, report, dedupe)
+
+    return report
+
+
+async def _write(
+    driver_connection,
+    insert_sql: str,
+    overwritten_sql: str,
+    batch: list,
+    hashed: list,
+    created_by: str,
+    report: ImportReport,
+    dedupe: bool = False
+):
+    records = [
+        (user.username, str(user.email), hashed_password, created_by)
+        for user, hashed_password in zip(batch, hashed)
+    ]
+    unique = dedupe_batch(records) if dedupe else records
+    if len(unique) < len(records):
+        report.duplicates += len(records) - len(unique)
+        logger.warning(f"Dropped {len(records) - len(unique)} rows repeating an email or username in this batch")
+    written, stale = await _copy_batch(driver_connection, unique, insert_sql, overwritten_sql)
+    # After commit: new rows clear negative entries, overwritten ones their old credentials
+    await user_cache.invalidate_many(stale)
+    report.written += written
+    report.skipped += len(unique) - written
+    logger.info(
+        f"Imported {report.written} users ({report.skipped} skipped, {report.duplicates} duplicates) "
+        f"at {report.rows_per_second:,.0f} rows/s"
+    )
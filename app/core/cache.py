@@ -0,0 +1,89 @@
+"""
+Key/value cache backends
+Redis for shared production caches, an in-process LRU for tests and
+single-node deploys
+"""
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class CacheBackend:
+    """Interface every cache backend implements"""
+
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: int):
+        raise NotImplementedError
+
+    async def delete(self, *keys: str):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed cache shared by every worker"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: str, ttl: int):
+        await self._redis.set(key, value, ex=ttl)
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def create_cache_backend(kind: str) -> Optional[CacheBackend]:
+    """Build the configured backend, or None when caching is disabled"""
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return MemoryCacheBackend(max_size=settings.USER_CACHE_SIZE)
+    if kind == "redis":
+        return RedisCacheBackend(settings.REDIS_URL)
+    raise ValueError(f"Unknown cache backend: {kind}")
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
@@ -11,10 +12,101 @@ class Settings(BaseSettings):
     DATABASE_PORT: str = "5432"
     DATABASE_NAME: str = "boxchat_db"
     
+    # Read replicas: comma-separated host[:port] list, same credentials as the primary
+    DATABASE_REPLICA_HOSTS: str = ""
+    DB_REPLICA_SELECTION: str = "round_robin"
+    
+    # Connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 5
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    
     # Security
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # "HS256", "EdDSA" or "RS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    
+    # Access token revocation (in-memory bloom filter + exact set, synced from the DB)
+    REVOCATION_SYNC_SECONDS: float = 5.0
+    REVOCATION_BLOOM_BITS: int = 1048576
+    REVOCATION_BLOOM_HASHES: int = 7
+    
+    # Asymmetric signing keys (EdDSA/RS256), see app/core/keys.py
+    JWT_KEYS_DIR: str = "keys"
+    JWT_ACTIVE_KID: str = ""
+    # Also accept HS256 tokens issued before the switch. Anyone holding SECRET_KEY can
+    # mint those, so enable it only for one access-token lifetime after switching
+    JWT_ACCEPT_HS256: bool = False
+    
+    # Password hashing pool ("thread" or "process", 0 workers = CPU count)
+    HASH_POOL_KIND: str = "thread"
+    HASH_POOL_WORKERS: int = 0
+    HASH_QUEUE_SIZE: int = 64
+    
+    # User lookup cache ("memory", "redis" or "none"); opt-in, since cached
+    # entries hold bcrypt password hashes
+    USER_CACHE_BACKEND: str = "none"
+    USER_CACHE_TTL: int = 300
+    USER_CACHE_NEGATIVE_TTL: int = 5
+    USER_CACHE_SIZE: int = 10000
+    REDIS_URL: str = "redis://localhost:6379/0"
+    
+    # Login rate limiting ("memory", "redis" or "none")
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    LOGIN_IP_RATE_PER_MINUTE: int = 60
+    LOGIN_IP_BURST: int = 20
+    # Per identifier across all IPs; roomier than the per-IP budget so an attacker
+    # can't cheaply lock the account's owner out
+    LOGIN_IDENTIFIER_RATE_PER_MINUTE: int = 30
+    LOGIN_IDENTIFIER_BURST: int = 10
+    
+    # Login audit events, written behind the request in batches
+    AUDIT_EVENTS_ENABLED: bool = True
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_SECONDS: float = 1.0
+    AUDIT_OVERFLOW: str = "drop"  # "drop" or "spill"
+    AUDIT_SPILL_PATH: str = "audit_spill.ndjson"
+    
+    # Per-request SQL profiler; when enabled, requests sending X-SQL-Profile
+    # (or every request with SQL_PROFILER_ALL) are profiled
+    SQL_PROFILER_ENABLED: bool = False
+    SQL_PROFILER_ALL: bool = False
+    SQL_PROFILER_MAX_QUERIES: int = 10
+    SQL_PROFILER_MAX_DB_MS: float = 100.0
+    SQL_PROFILER_SLOW_MS: float = 50.0
+    SQL_PROFILER_REPEAT_THRESHOLD: int = 3
+    SQL_PROFILER_EXPLAIN: bool = False
+    
+    # Traffic capture for replay load tests (benchmarks/replay.py); identifiers
+    # are stored as HMACs keyed with TRAFFIC_CAPTURE_HASH_KEY, which is required when enabled
+    # and must not be shared with any other secret
+    TRAFFIC_CAPTURE_ENABLED: bool = False
+    TRAFFIC_CAPTURE_PATH: str = "traffic_capture.jsonl"
+    TRAFFIC_CAPTURE_SAMPLE_RATE: float = 1.0
+    TRAFFIC_CAPTURE_HASH_KEY: str = ""
+    TRAFFIC_CAPTURE_QUEUE_SIZE: int = 10000
+    
+    # Verified token cache (0 disables it)
+    TOKEN_CACHE_SIZE: int = 10000
+    
+    # Prefork server (serve.py); 0 workers means one per CPU
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_MAX_REQUESTS: int = 0  # 0 disables recycling
+    SERVER_MAX_REQUESTS_JITTER: int = 0
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    
+    # Startup: COLD_START skips pool/crypto warm-up so workers accept traffic sooner
+    COLD_START: bool = False
+    ADMIN_BOOTSTRAP: str = "startup"  # "startup", "background" or "skip"
     
     # Default admin user
     username: str = "admin"
@@ -28,4 +120,10 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache
+def get_settings() -> Settings:
+    """The process-wide settings; .env is read and validated only once"""
+    return Settings()
+
+
+settings = get_settings()
\ No newline at end of file
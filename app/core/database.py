@@ -1,18 +1,223 @@
+import asyncio
+import itertools
+import time
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import Settings
-settings = Settings()
-
-DATABASE_URL = (
-    f"postgresql+asyncpg://{settings.DATABASE_USER}:"
-    f"{settings.DATABASE_PASSWORD}@"
-    f"{settings.DATABASE_HOST}:"
-    f"{settings.DATABASE_PORT}/"
-    f"{settings.DATABASE_NAME}"
-)
-engine = create_async_engine(DATABASE_URL, echo=False)
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Optional
+from app.core.config import settings
+from app.core.sql_profiler import sql_profiler
+
+
+def build_database_url(host: str, port: str) -> str:
+    return (
+        f"postgresql+asyncpg://{settings.DATABASE_USER}:"
+        f"{settings.DATABASE_PASSWORD}@"
+        f"{host}:"
+        f"{port}/"
+        f"{settings.DATABASE_NAME}"
+        f"?prepared_statement_cache_size={settings.DB_STATEMENT_CACHE_SIZE}"
+    )
+
+
+DATABASE_URL = build_database_url(settings.DATABASE_HOST, settings.DATABASE_PORT)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait to check out a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_total += waited
+            if waited > self.wait_max:
+                self.wait_max = waited
+
+
+def create_pooled_engine(url: str):
+    engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+    if settings.SQL_PROFILER_ENABLED:
+        sql_profiler.install(engine)
+    return engine
+
+
+def _parse_replica_hosts(value: str) -> list[tuple[str, str]]:
+    """Parse "host1:5433,host2" into (host, port) pairs"""
+    hosts = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(":")
+        hosts.append((host, port or settings.DATABASE_PORT))
+    return hosts
+
+
+# Engines are built on first use: creating one imports the asyncpg dialect,
+# which is a large share of import time for short-lived workers
+_engine = None
+_replica_engines: Optional[list] = None
+_replica_selector = None
+
+
+def get_engine():
+    """The primary engine, created on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_pooled_engine(DATABASE_URL)
+    return _engine
+
+
+def get_replica_engines() -> list:
+    global _replica_engines
+    if _replica_engines is None:
+        _replica_engines = [
+            create_pooled_engine(build_database_url(host, port))
+            for host, port in _parse_replica_hosts(settings.DATABASE_REPLICA_HOSTS)
+        ]
+    return _replica_engines
+
+
+def replica_count() -> int:
+    """Number of configured replicas, without creating their engines"""
+    return len(_parse_replica_hosts(settings.DATABASE_REPLICA_HOSTS))
+
+
+def __getattr__(name):
+    # Keeps `from app.core.database import engine` working without eager creation
+    if name == "engine":
+        return get_engine()
+    if name == "replica_engines":
+        return get_replica_engines()
+    if name == "replica_selector":
+        return get_replica_selector()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class PrimarySession(Session):
+    """Session bound to the primary engine, resolved when the first statement runs"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return get_engine().sync_engine
+
+
 AsyncSessionLocal = sessionmaker(
-    bind=engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    expire_on_commit=False
+)
+
+
+class ReplicaSelector:
+    """Picks a replica engine by round robin or by fewest checked-out connections"""
+
+    def __init__(self, engines: list, strategy: str = "round_robin"):
+        if strategy not in ("round_robin", "least_busy"):
+            raise ValueError(f"Unknown replica selection strategy: {strategy}")
+        self.engines = engines
+        self.strategy = strategy
+        self._cycle = itertools.cycle(engines) if engines else None
+
+    def choose(self):
+        if not self.engines:
+            return None
+        if self.strategy == "least_busy":
+            return min(self.engines, key=lambda replica: replica.pool.checkedout())
+        return next(self._cycle)
+
+
+def get_replica_selector() -> ReplicaSelector:
+    global _replica_selector
+    if _replica_selector is None:
+        _replica_selector = ReplicaSelector(get_replica_engines(), settings.DB_REPLICA_SELECTION)
+    return _replica_selector
+
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to a replica and pins the session to the primary after any write"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("pinned_to_primary") or self._flushing or not isinstance(clause, Select):
+            # Everything after a write reads from the primary (read-your-writes)
+            if clause is not None and not isinstance(clause, Select):
+                self.info["pinned_to_primary"] = True
+            return get_engine().sync_engine
+
+        # Stay on one replica for the whole session so reads are consistent
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = get_replica_selector().choose()
+            if replica is None:
+                return get_engine().sync_engine
+            self.info["replica"] = replica
+        return replica.sync_engine
+
+
+ReadSessionLocal = sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False
-)
\ No newline at end of file
+)
+
+
+async def warm_pool(statements: list, connections: int = None):
+    """Open connections up front and prepare the given statements on each
+
+    A callable entry is called once per connection for its statement, for
+    statements whose parameters must differ between connections. Everything
+    runs in a transaction that is rolled back.
+    """
+    if connections is None:
+        connections = settings.DB_POOL_WARMUP
+    connections = min(connections, settings.DB_POOL_SIZE)
+
+    async def warm_connection():
+        async with get_engine().connect() as conn:
+            # Executing once stores the prepared statement in the connection's cache
+            for statement in statements:
+                await conn.execute(statement() if callable(statement) else statement)
+            await conn.rollback()
+
+    await asyncio.gather(*(warm_connection() for _ in range(connections)))
+
+
+def pool_stats(target=None) -> dict:
+    """Connection pool usage for capacity planning (primary engine by default)"""
+    pool = (target or get_engine()).pool
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, TimedQueuePool):
+        stats.update({
+            "waits": pool.wait_count,
+            "wait_seconds": pool.wait_total,
+            "wait_max_seconds": pool.wait_max,
+        })
+    return stats
+
+
+def replica_pool_stats(index: int) -> dict:
+    return pool_stats(get_replica_engines()[index])
@@ -0,0 +1,92 @@
+"""
+Async password hashing
+Dispatches bcrypt work to a bounded thread or process pool so it never
+blocks the event loop
+"""
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+from app.core.security import hash_password, verify_password
+
+
+class HashingQueueFullError(Exception):
+    """Raised when the hashing pool has no room for more work"""
+
+
+class PasswordHasher:
+    """Bounded worker pool for bcrypt hashing and verification"""
+
+    def __init__(self, kind: str = "thread", workers: Optional[int] = None, queue_size: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown hashing pool kind: {kind}")
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.max_pending = self.workers + queue_size
+        self._executor: Optional[Executor] = None
+
+        # Metrics
+        self.pending = 0
+        self.submitted = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _submit(self, fn, *args):
+        # Reject immediately instead of letting the backlog grow without bound
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingQueueFullError("Password hashing queue is full")
+
+        self.pending += 1
+        self.submitted += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash_password(self, password: str) -> str:
+        """Hash a password in the worker pool"""
+        return await self._submit(hash_password, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash in the worker pool"""
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Current queue depth and counters"""
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queued": max(self.pending - self.workers, 0),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    kind=settings.HASH_POOL_KIND,
+    workers=settings.HASH_POOL_WORKERS,
+    queue_size=settings.HASH_QUEUE_SIZE
+)
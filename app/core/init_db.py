@@ -7,8 +7,10 @@ from sqlalchemy.future import select
 from app.api.v1.user.models import User
 from app.core.security import hash_password
 from app.core.config import settings
-from app.core.database import AsyncSessionLocal
+from app.core.database import AsyncSessionLocal, warm_pool
+from app.api.v1.user.repository import login_user_query, register_user_query
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +26,18 @@ async def init_default_admin():
             existing_user = result.scalars().first()
             
             if existing_user:
+                # Never promoted here: the address may have been self-registered
+                # before the bootstrap ran. Use set_admin.py to grant admin.
+                if not existing_user.is_admin:
+                    logger.warning(f"{settings.email} exists but is not an admin; left unchanged")
                 return
             
             # Create default admin user
             admin_user = User(
                 username=settings.username,
                 email=settings.email,
-                hashed_password=hash_password(settings.password)
+                hashed_password=hash_password(settings.password),
+                is_admin=True
             )
             
             db.add(admin_user)
@@ -45,3 +52,33 @@ async def init_default_admin():
             raise
         finally:
             await db.close()
+
+
+async def set_admin(email: str, is_admin: bool = True):
+    """Grant or revoke admin rights for an existing user"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
+        if user is None:
+            raise ValueError(f"No user with email {email}")
+        user.is_admin = is_admin
+        await db.commit()
+
+
+def _register_warmup_query():
+    # Rolled back by warm_pool; unique per connection so concurrent warm-ups
+    # don't wait on each other's uncommitted row. Each one uses up an id.
+    placeholder = f"warmup-{uuid.uuid4().hex}@invalid"
+    return register_user_query(placeholder, placeholder, "!")
+
+
+async def warm_up_database():
+    """Pre-open pooled connections and prepare the hot login and register statements"""
+    placeholder = "warmup@invalid"
+    statements = [
+        login_user_query(email=placeholder),
+        login_user_query(username=placeholder),
+        _register_warmup_query,
+    ]
+    await warm_pool(statements)
+    logger.info("Database connection pool warmed up")
@@ -0,0 +1,109 @@
+"""
+Asymmetric JWT signing keys
+Loads a rotation set of EdDSA (Ed25519) or RS256 keys from a directory and
+exposes them as a kid -> key index and a JWKS document.
+
+Layout of JWT_KEYS_DIR:
+    <kid>.pem       PEM private key; can sign and verify
+    <kid>.pub.pem   PEM public key of a retired key; verify only
+
+Rotate by adding a new private key (e.g. `openssl genpkey -algorithm ed25519
+-out keys/2026-10.pem`), pointing JWT_ACTIVE_KID at it once every instance
+has loaded it, and deleting the old key after the token lifetime has passed.
+"""
+import base64
+import os
+from typing import Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding, rsa
+
+SUPPORTED_ALGORITHMS = ("EdDSA", "RS256")
+
+
+def _b64url_uint(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+class SigningKey:
+    """One key in the ring; private_key is None for verify-only keys"""
+
+    def __init__(self, kid: str, public_key, private_key=None):
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            self.algorithm = "EdDSA"
+        elif isinstance(public_key, rsa.RSAPublicKey):
+            self.algorithm = "RS256"
+        else:
+            raise ValueError(f"Unsupported key type for kid {kid}: {type(public_key).__name__}")
+        self.kid = kid
+        self.public_key = public_key
+        self.private_key = private_key
+
+    def sign(self, data: bytes) -> bytes:
+        if self.private_key is None:
+            raise ValueError(f"Key {self.kid} is verify-only")
+        if self.algorithm == "EdDSA":
+            return self.private_key.sign(data)
+        return self.private_key.sign(data, padding.PKCS1v15(), hashes.SHA256())
+
+    def verify(self, signature: bytes, data: bytes) -> bool:
+        try:
+            if self.algorithm == "EdDSA":
+                self.public_key.verify(signature, data)
+            else:
+                self.public_key.verify(signature, data, padding.PKCS1v15(), hashes.SHA256())
+        except InvalidSignature:
+            return False
+        return True
+
+    def jwk(self) -> dict:
+        """Public JWK for this key"""
+        if self.algorithm == "EdDSA":
+            raw = self.public_key.public_bytes(
+                encoding=serialization.Encoding.Raw,
+                format=serialization.PublicFormat.Raw
+            )
+            jwk = {"kty": "OKP", "crv": "Ed25519", "x": base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")}
+        else:
+            numbers = self.public_key.public_numbers()
+            jwk = {"kty": "RSA", "n": _b64url_uint(numbers.n), "e": _b64url_uint(numbers.e)}
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+
+class KeyRing:
+    """kid -> key index plus the key currently used for signing"""
+
+    def __init__(self, keys: list[SigningKey], active_kid: Optional[str] = None):
+        self.keys = {key.kid: key for key in keys}
+        signing_kids = sorted(key.kid for key in keys if key.private_key is not None)
+        if active_kid is None and signing_kids:
+            # Newest by name, e.g. date-stamped kids
+            active_kid = signing_kids[-1]
+        if active_kid not in self.keys or self.keys[active_kid].private_key is None:
+            raise ValueError(f"No private key for active kid {active_kid!r}")
+        self.active = self.keys[active_kid]
+
+    def get(self, kid: str) -> Optional[SigningKey]:
+        return self.keys.get(kid)
+
+    def jwks(self) -> dict:
+        """JWKS document with every key that can still verify tokens"""
+        return {"keys": [key.jwk() for key in self.keys.values()]}
+
+    @classmethod
+    def from_directory(cls, path: str, active_kid: Optional[str] = None) -> "KeyRing":
+        keys = []
+        for name in sorted(os.listdir(path)):
+            with open(os.path.join(path, name), "rb") as f:
+                data = f.read()
+            if name.endswith(".pub.pem"):
+                keys.append(SigningKey(name[:-len(".pub.pem")], serialization.load_pem_public_key(data)))
+            elif name.endswith(".pem"):
+                private_key = serialization.load_pem_private_key(data, password=None)
+                keys.append(SigningKey(name[:-len(".pem")], private_key.public_key(), private_key))
+        if not keys:
+            raise ValueError(f"No PEM keys found in {path}")
+        return cls(keys, active_kid)
@@ -0,0 +1,123 @@
+"""
+Low-overhead in-process metrics
+Histograms for per-stage and per-route latency plus callback gauges and
+counters, rendered in the Prometheus text format
+"""
+import time
+from bisect import bisect_left
+from typing import Callable
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and two additions"""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # One extra slot for observations above the largest bucket (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Holds every histogram, gauge and counter exposed on /metrics"""
+
+    def __init__(self):
+        self._histograms: dict[str, tuple[str, dict]] = {}
+        self._stats: list[tuple[str, str, Callable[[], dict], frozenset]] = []
+
+    def histogram(self, name: str, help_text: str):
+        self._histograms.setdefault(name, (help_text, {}))
+
+    def observe(self, name: str, value: float, labels: tuple):
+        """Record a value; labels is a tuple of (key, value) pairs"""
+        series = self._histograms[name][1]
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram()
+        histogram.observe(value)
+
+    def register_stats(self, prefix: str, help_text: str, stats: Callable[[], dict], counters: tuple = ()):
+        """Expose every numeric value returned by stats() as prefix_key
+
+        Keys in counters are monotonic totals and become counters named
+        prefix_key_total, so rate() handles restarts; the rest are gauges.
+        """
+        self._stats.append((prefix, help_text, stats, frozenset(counters)))
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, (help_text, series) in self._histograms.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in series.items():
+                label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                prefix = f"{label_text}," if label_text else ""
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{label_text}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+
+        for prefix, help_text, stats, counters in self._stats:
+            for key, value in stats().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                if key in counters:
+                    name, kind = f"{prefix}_{key}_total", "counter"
+                else:
+                    name, kind = f"{prefix}_{key}", "gauge"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+registry.histogram("app_stage_duration_seconds", "Time spent in each stage of request handling")
+registry.histogram("http_request_duration_seconds", "HTTP request latency by route")
+
+
+class StageTimer:
+    """Context manager recording the duration of a named stage"""
+    __slots__ = ("labels", "start")
+
+    def __init__(self, stage: str):
+        self.labels = (("stage", stage),)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        registry.observe("app_stage_duration_seconds", time.perf_counter() - self.start, self.labels)
+        return False
+
+
+def timed(stage: str) -> StageTimer:
+    """Time a block: `with timed("db_lookup"): ...`"""
+    return StageTimer(stage)
+
+
+def observe_request(method: str, route: str, status: int, duration: float):
+    """Record the latency of one HTTP request"""
+    registry.observe(
+        "http_request_duration_seconds",
+        duration,
+        (("method", method), ("route", route), ("status", str(status)))
+    )
@@ -1,36 +1,75 @@
 #middleware for authorization
-from fastapi import Request, HTTPException, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+import re
+from starlette.responses import JSONResponse
 from starlette.status import HTTP_401_UNAUTHORIZED
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core.security import verify_token
+from app.core.token_cache import token_cache
+from app.core.revocation import revocation_store
+from app.core.metrics import timed
 
-public_routes = ["/public", "/docs", "/openapi.json", "/auth"]
+public_routes = ["/public", "/docs", "/openapi.json", "/auth", "/metrics", "/.well-known"]
 
-class AuthorizeMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        path = request.url.path
 
-        print( f"AuthorizeMiddleware: Processing request for path: {path}" )
-        if any(path.startswith(route) for route in public_routes):
-            return await call_next(request)
-        
-        token = request.headers.get("Authorization")
+def compile_public_routes(routes: list[str]) -> re.Pattern:
+    """Build a single anchored regex matching any of the route prefixes"""
+    # Longest prefixes first so the alternation never stops on a shorter match
+    prefixes = sorted(routes, key=len, reverse=True)
+    return re.compile("|".join(re.escape(prefix) for prefix in prefixes))
+
+
+class AuthorizeMiddleware:
+    """Pure ASGI middleware that rejects requests without a valid bearer token"""
+
+    def __init__(self, app: ASGIApp, routes: list[str] = None):
+        self.app = app
+        self.public_route_pattern = compile_public_routes(
+            public_routes if routes is None else routes
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.public_route_pattern.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                token = value.decode("latin-1")
+                break
+
         if not token:
-            raise HTTPException(
-                status_code=HTTP_401_UNAUTHORIZED,
-                detail="Authorization token missing"
-            )
-        
+            await self._unauthorized(scope, receive, send, "Authorization token missing")
+            return
+
         # Remove 'Bearer ' prefix if present
         if token.startswith("Bearer "):
             token = token[7:]
-        
-        payload = verify_token(token)
+
+        with timed("authorize"):
+            payload = token_cache.get(token)
+            if payload is None:
+                payload = verify_token(token)
+                if payload:
+                    token_cache.put(token, payload)
         if not payload:
-            raise HTTPException(
-                status_code=HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token"
-            )
-        
-        response = await call_next(request)
-        return response
\ No newline at end of file
+            await self._unauthorized(scope, receive, send, "Invalid or expired token")
+            return
+        # Checked on every request, cached or not; an in-memory lookup, no DB round trip
+        if revocation_store.is_revoked(payload.get("jti")):
+            await self._unauthorized(scope, receive, send, "Token has been revoked")
+            return
+
+        # Expose the decoded claims so handlers never decode the token again
+        scope.setdefault("state", {})["token_payload"] = payload
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _unauthorized(scope: Scope, receive: Receive, send: Send, detail: str) -> None:
+        response = JSONResponse(
+            {"detail": detail},
+            status_code=HTTP_401_UNAUTHORIZED,
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+        await response(scope, receive, send)
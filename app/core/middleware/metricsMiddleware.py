@@ -0,0 +1,37 @@
+#middleware for request latency metrics
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import observe_request
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency per method, route template and status"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by route template, not raw path, to keep cardinality bounded
+            route = scope.get("route")
+            observe_request(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status,
+                time.perf_counter() - start
+            )
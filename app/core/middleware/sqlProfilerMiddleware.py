@@ -0,0 +1,39 @@
+#middleware for per-request SQL profiling
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.sql_profiler import PROFILE_HEADER, RequestProfile, SqlProfiler, current_profile, sql_profiler
+
+
+class SqlProfilerMiddleware:
+    """Pure ASGI middleware that profiles requests sending X-SQL-Profile, or all of them"""
+
+    def __init__(self, app: ASGIApp, profiler: SqlProfiler = None, profile_all: bool = False):
+        self.app = app
+        self.profiler = profiler or sql_profiler
+        self.profile_all = profile_all
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (
+            self.profile_all or any(name == PROFILE_HEADER for name, _ in scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(f"{scope['method']} {scope['path']}")
+        token = current_profile.set(profile)
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Covers statements up to the response; the log line also has any after it
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_HEADER, self.profiler.summary(profile).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            current_profile.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                profile.label = f"{scope['method']} {route.path}"
+            self.profiler.report(profile)
@@ -0,0 +1,87 @@
+#middleware for traffic capture
+import json
+import random
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.traffic_capture import IDENTIFIER_FIELDS, identifier_hash, traffic_capture
+from app.core.write_behind import WriteBehindBuffer
+
+# Larger bodies are passed through but not inspected
+MAX_CAPTURED_BODY = 16 * 1024
+
+
+def sanitize_body(body: bytes) -> tuple[list[str], dict]:
+    """Field names of a JSON object body, and hashes of its identifier fields"""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return [], {}
+    if not isinstance(data, dict):
+        return [], {}
+    identifiers = {
+        field: identifier_hash(data[field])
+        for field in IDENTIFIER_FIELDS
+        if isinstance(data.get(field), str) and data[field]
+    }
+    return sorted(data), identifiers
+
+
+class TrafficCaptureMiddleware:
+    """Pure ASGI middleware recording a sanitized line per request for later replay"""
+
+    def __init__(self, app: ASGIApp, buffer: WriteBehindBuffer = None, sample_rate: float = 1.0):
+        self.app = app
+        self.buffer = buffer or traffic_capture
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        chunks = []
+        captured = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal captured
+            message = await receive()
+            # Tee the body as the app reads it; nothing is consumed on the app's behalf
+            if message["type"] == "http.request" and captured <= MAX_CAPTURED_BODY:
+                body = message.get("body", b"")
+                captured += len(body)
+                chunks.append(body)
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            route = scope.get("route")
+            record = {
+                "ts": round(started_at, 6),
+                "method": scope["method"],
+                "route": route.path if route is not None else "unmatched",
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round(duration * 1000, 3),
+            }
+            if chunks and captured <= MAX_CAPTURED_BODY:
+                fields, identifiers = sanitize_body(b"".join(chunks))
+                if fields:
+                    record["fields"] = fields
+                if identifiers:
+                    record["identifiers"] = identifiers
+            # Set by AuthorizeMiddleware when it runs inside this one
+            payload = scope.get("state", {}).get("token_payload")
+            if payload and isinstance(payload.get("sub"), str):
+                record["subject"] = identifier_hash(payload["sub"])
+            self.buffer.submit(record)
@@ -0,0 +1,141 @@
+"""
+Prefork multi-worker server
+The supervisor binds the listening socket once and spawns uvicorn workers
+that all accept on it. A worker runs the app lifespan (pool, bcrypt and
+token codec warm-up) before it starts accepting, so connections queue in
+the shared backlog and go to workers that are already warm. Workers that
+exit, whether recycled after max requests or crashed, are replaced.
+"""
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+from typing import Optional
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# A worker that dies sooner than this after starting is treated as crash-looping
+MIN_WORKER_LIFETIME = 5.0
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _run_worker(config_kwargs: dict, sock: socket.socket):
+    server = uvicorn.Server(uvicorn.Config(**config_kwargs))
+    try:
+        server.run(sockets=[sock])
+    except KeyboardInterrupt:
+        # Ctrl+C reaches the whole process group; uvicorn has already shut down cleanly
+        pass
+
+
+class PreforkServer:
+    """Supervises a fixed number of uvicorn workers sharing one listening socket"""
+
+    def __init__(
+        self,
+        app: str = "main:app",
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        workers: Optional[int] = None,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        graceful_timeout: int = 30,
+        log_level: str = "info"
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers or default_workers()
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+
+        # Spawn, not fork: workers import the app themselves instead of inheriting
+        # the supervisor's state, and the socket is handed over explicitly
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: dict[int, multiprocessing.Process] = {}
+        self._started_at: dict[int, float] = {}
+        self._socket: Optional[socket.socket] = None
+        self._should_exit = False
+
+        # Metrics
+        self.restarts = 0
+
+    def _worker_config(self) -> dict:
+        limit = None
+        if self.max_requests > 0:
+            # Jitter so workers started together don't all recycle at once
+            limit = self.max_requests + random.randint(0, max(self.max_requests_jitter, 0))
+        return {
+            "app": self.app,
+            "limit_max_requests": limit,
+            "timeout_graceful_shutdown": self.graceful_timeout,
+            "log_level": self.log_level,
+        }
+
+    def _spawn(self, slot: int):
+        process = self._context.Process(
+            target=_run_worker,
+            args=(self._worker_config(), self._socket),
+            name=f"worker-{slot}"
+        )
+        process.start()
+        self._processes[slot] = process
+        self._started_at[slot] = time.monotonic()
+        logger.info(f"Started worker {slot} (pid {process.pid})")
+
+    def _handle_exit(self, signum, frame):
+        self._should_exit = True
+
+    def _reap(self):
+        for slot, process in list(self._processes.items()):
+            if process.is_alive() or self._should_exit:
+                continue
+            process.join()
+            lifetime = time.monotonic() - self._started_at[slot]
+            if process.exitcode != 0 and lifetime < MIN_WORKER_LIFETIME:
+                logger.error(f"Worker {slot} exited with {process.exitcode} after {lifetime:.1f}s, backing off")
+                time.sleep(1)
+            else:
+                logger.info(f"Worker {slot} exited with {process.exitcode}, replacing it")
+            self.restarts += 1
+            self._spawn(slot)
+
+    def _stop_workers(self):
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + self.graceful_timeout
+        for process in self._processes.values():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning(f"Worker pid {process.pid} did not stop in time, killing it")
+                process.kill()
+                process.join()
+
+    def run(self):
+        config = uvicorn.Config(self.app, host=self.host, port=self.port, log_level=self.log_level)
+        self._socket = config.bind_socket()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self._handle_exit)
+
+        logger.info(f"Starting {self.workers} workers on {self.host}:{self.port}")
+        try:
+            for slot in range(self.workers):
+                self._spawn(slot)
+            while not self._should_exit:
+                self._reap()
+                time.sleep(0.5)
+        finally:
+            self._stop_workers()
+            self._socket.close()
+        logger.info(f"Stopped {self.workers} workers ({self.restarts} restarts)")
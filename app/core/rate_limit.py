@@ -0,0 +1,133 @@
+"""
+Token-bucket rate limiting
+In-memory buckets with bounded per-key state, or Redis buckets shared by
+every worker
+"""
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+
+class RateLimiter:
+    """Interface every rate limiter backend implements"""
+
+    async def hit(self, key: str) -> float:
+        """Take one token for key; return 0 if allowed, else seconds until retry"""
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Token buckets held in an LRU so memory stays bounded under many-key attacks"""
+
+    def __init__(self, rate_per_minute: float, burst: int, max_keys: int = 100000):
+        self.rate = rate_per_minute / 60.0
+        self.burst = float(burst)
+        self.max_keys = max_keys
+        # key -> [tokens, last refill timestamp], mutated in place
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+        # Metrics
+        self.rejected = 0
+        self.evictions = 0
+
+    async def hit(self, key: str) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._buckets.move_to_end(key)
+            tokens = bucket[0] + (now - bucket[1]) * self.rate
+            bucket[0] = tokens if tokens < self.burst else self.burst
+            bucket[1] = now
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return 0.0
+
+        self.rejected += 1
+        return (1.0 - bucket[0]) / self.rate
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._buckets),
+            "max_keys": self.max_keys,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+        }
+
+
+# Refill and take a token atomically; returns retry-after in milliseconds (0 = allowed)
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate))
+return retry
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """Token buckets in Redis, shared across workers; keys expire once full again"""
+
+    def __init__(self, url: str, prefix: str, rate_per_minute: float, burst: int):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(_REDIS_TOKEN_BUCKET)
+        self.prefix = prefix
+        # Rates are per millisecond to match the timestamps passed to the script
+        self.rate = rate_per_minute / 60000.0
+        self.burst = burst
+
+    async def hit(self, key: str) -> float:
+        now_ms = int(time.time() * 1000)
+        retry_ms = await self._script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[self.rate, self.burst, now_ms]
+        )
+        return int(retry_ms) / 1000.0
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def create_rate_limiter(prefix: str, rate_per_minute: float, burst: int):
+    """Build the configured limiter, or None when rate limiting is disabled"""
+    backend = settings.RATE_LIMIT_BACKEND
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryRateLimiter(rate_per_minute, burst, max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    if backend == "redis":
+        return RedisRateLimiter(settings.REDIS_URL, prefix, rate_per_minute, burst)
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+login_ip_limiter = create_rate_limiter(
+    "ratelimit:login:ip",
+    settings.LOGIN_IP_RATE_PER_MINUTE,
+    settings.LOGIN_IP_BURST
+)
+login_identifier_limiter = create_rate_limiter(
+    "ratelimit:login:identifier",
+    settings.LOGIN_IDENTIFIER_RATE_PER_MINUTE,
+    settings.LOGIN_IDENTIFIER_BURST
+)
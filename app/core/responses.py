@@ -0,0 +1,20 @@
+"""
+Fast JSON responses
+Pydantic models are serialized straight to JSON bytes by pydantic-core;
+anything else goes through orjson. Returning a FastJSONResponse from a
+handler also skips FastAPI's response_model pass, which would dump,
+re-validate and re-serialize a model the handler has already built.
+"""
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class FastJSONResponse(ORJSONResponse):
+    """Default response class; accepts a pydantic model as content"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
@@ -0,0 +1,130 @@
+"""
+Access token revocation store
+A bloom filter in front of an exact jti -> expiry map, so the common
+not-revoked case is a few bit probes and never touches the DB
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size bloom filter using double hashing over one blake2b digest"""
+
+    def __init__(self, size_bits: int = 1 << 20, hashes: int = 7):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self._bits = bytearray((size_bits + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, value: str) -> bool:
+        bits = self._bits
+        for position in self._positions(value):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationStore:
+    """In-memory set of revoked token ids, synced periodically from durable storage"""
+
+    def __init__(self, bloom_bits: int = 1 << 20, bloom_hashes: int = 7):
+        self.bloom_bits = bloom_bits
+        self.bloom_hashes = bloom_hashes
+        self._bloom = BloomFilter(bloom_bits, bloom_hashes)
+        self._revoked: dict[str, float] = {}
+        # Soonest expiry in _revoked, so a sync with nothing expired skips the purge
+        self._next_expiry: Optional[float] = None
+        self.last_synced_at: Optional[float] = None
+
+        # Metrics
+        self.checks = 0
+        self.bloom_hits = 0
+        self.purges = 0
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Constant-time check; the exact map is only consulted on a bloom hit"""
+        if jti is None:
+            return False
+        self.checks += 1
+        if not self._bloom.might_contain(jti):
+            return False
+        self.bloom_hits += 1
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def revoke(self, jti: str, expires_at: float):
+        self._revoked[jti] = expires_at
+        self._bloom.add(jti)
+        if self._next_expiry is None or expires_at < self._next_expiry:
+            self._next_expiry = expires_at
+
+    def load(self, entries: Iterable[tuple[str, float]]):
+        for jti, expires_at in entries:
+            self.revoke(jti, expires_at)
+
+    def purge_expired(self):
+        """Drop expired entries and rebuild the bloom filter, which can't delete
+
+        A no-op until the soonest expiry has passed, so most syncs never
+        touch the map or the filter.
+        """
+        now = time.time()
+        if self._next_expiry is None or self._next_expiry > now:
+            return
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        self._next_expiry = min(self._revoked.values(), default=None)
+        self.purges += 1
+        bloom = BloomFilter(self.bloom_bits, self.bloom_hashes)
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    async def run_sync(
+        self,
+        loader: Callable[[Optional[float]], Awaitable[list[tuple[str, float]]]],
+        interval: float
+    ):
+        """Pull revocations recorded since the last sync every interval seconds"""
+        while True:
+            try:
+                await self.sync(loader)
+            except Exception as e:
+                logger.error(f"Revocation sync failed: {str(e)}")
+            await asyncio.sleep(interval)
+
+    async def sync(self, loader: Callable[[Optional[float]], Awaitable[list[tuple[str, float]]]]):
+        started_at = time.time()
+        self.load(await loader(self.last_synced_at))
+        self.purge_expired()
+        self.last_synced_at = started_at
+
+    def stats(self) -> dict:
+        return {
+            "revoked": len(self._revoked),
+            "checks": self.checks,
+            "bloom_hits": self.bloom_hits,
+            "purges": self.purges,
+        }
+
+
+revocation_store = RevocationStore(
+    bloom_bits=settings.REVOCATION_BLOOM_BITS,
+    bloom_hashes=settings.REVOCATION_BLOOM_HASHES
+)
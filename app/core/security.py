@@ -1,16 +1,58 @@
-from datetime import datetime, timedelta
+import hashlib
+import time
+from datetime import timedelta
 from typing import Optional
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 from app.core.config import settings
+from app.core.token_codec import AsymmetricTokenCodec, HS256TokenCodec
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; passlib is imported and configured on first use
+_pwd_context = None
+
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 # JWT settings
 SECRET_KEY = getattr(settings, 'SECRET_KEY')
-ALGORITHM = "HS256"
+ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+
+
+def _create_token_codec():
+    if ALGORITHM == "HS256":
+        return HS256TokenCodec(SECRET_KEY)
+
+    from app.core.keys import SUPPORTED_ALGORITHMS, KeyRing
+    if ALGORITHM not in SUPPORTED_ALGORITHMS:
+        raise ValueError(f"Unsupported JWT algorithm: {ALGORITHM}")
+    keyring = KeyRing.from_directory(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID or None)
+    if keyring.active.algorithm != ALGORITHM:
+        raise ValueError(f"Active key {keyring.active.kid} is not an {ALGORITHM} key")
+    legacy_codec = HS256TokenCodec(SECRET_KEY) if settings.JWT_ACCEPT_HS256 else None
+    return AsymmetricTokenCodec(keyring, legacy_codec)
+
+
+# Built on first use so key files are only read by processes that handle tokens
+_token_codec = None
+
+
+def get_token_codec():
+    global _token_codec
+    if _token_codec is None:
+        _token_codec = _create_token_codec()
+    return _token_codec
+
+
+def warm_up_crypto():
+    """Build the bcrypt context and token codec ahead of the first request"""
+    # Loading the backend is the expensive part; a full hash is not needed
+    get_pwd_context().handler().get_backend()
+    get_token_codec()
 
 
 def _truncate_password(password: str, max_bytes: int = 72) -> str:
@@ -30,40 +72,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
     # Apply same truncation as hash_password for consistency
     plain_password = _truncate_password(plain_password)
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def hash_password(password: str) -> str:
     """Hash a password"""
     # Truncate password to 72 bytes if necessary (bcrypt limitation)
     password = _truncate_password(password)
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_token(token: str) -> Optional[dict]:
     """Verify JWT token and return the payload or None if invalid"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        return None
+    return get_token_codec().verify(token)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    if not expires_delta:
+        expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
-
-
-def decode_access_token(token: str) -> Optional[dict]:
-    """Decode JWT access token"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        return None
\ No newline at end of file
+    to_encode.update({"exp": int(time.time() + expires_delta.total_seconds())})
+    return get_token_codec().encode(to_encode)
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    """Refresh tokens are high-entropy random strings, so a fast hash is enough for storage"""
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+
+
+# Kept for existing callers; verify_token is the single verification API
+decode_access_token = verify_token
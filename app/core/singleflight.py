@@ -0,0 +1,39 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight computation
+"""
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicates concurrent async calls by key; nothing is cached once a call finishes"""
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+        # Metrics
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() once for all concurrent callers with the same key"""
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            # A task, not a bare coroutine, so one caller being cancelled doesn't cancel the others
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "shared": self.shared,
+        }
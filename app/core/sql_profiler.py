@@ -0,0 +1,168 @@
+"""
+Per-request SQL profiler
+Engine events attribute every statement and its duration to the request
+held in a contextvar. Requests over the query-count or DB-time budget, or
+repeating one statement shape (N+1), are flagged in an X-SQL-Profile
+response header and in the logs. Opt-in via SQL_PROFILER_ENABLED: with it
+off, neither the event listeners nor the middleware are installed.
+"""
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-sql-profile"
+
+current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "sql_profile", default=None
+)
+
+_placeholder = re.compile(r"\$\d+(?:::[A-Z]+)?|%\(\w+\)s|\?")
+_value_lists = re.compile(r"\(\?(?:, \?)*\)(?:, \(\?(?:, \?)*\))*")
+_whitespace = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement with placeholders, IN lists and multi-row VALUES collapsed"""
+    shape = _placeholder.sub("?", statement)
+    shape = _value_lists.sub("(?)", shape)
+    return _whitespace.sub(" ", shape).strip()
+
+
+class RequestProfile:
+    """Statements issued while handling one request"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.shapes: Counter = Counter()
+        self.count = 0
+        self.db_seconds = 0.0
+        # (shape, milliseconds, plan or None)
+        self.slow: list[tuple[str, float, Optional[str]]] = []
+
+    def add(self, shape: str, seconds: float):
+        self.shapes[shape] += 1
+        self.count += 1
+        self.db_seconds += seconds
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+class SqlProfiler:
+    """Budgets and engine listeners for request profiling"""
+
+    def __init__(
+        self,
+        max_queries: int = 10,
+        max_db_ms: float = 100.0,
+        slow_ms: float = 50.0,
+        repeat_threshold: int = 3,
+        explain: bool = False
+    ):
+        self.max_queries = max_queries
+        self.max_db_ms = max_db_ms
+        self.slow_ms = slow_ms
+        self.repeat_threshold = repeat_threshold
+        self.explain = explain
+
+        # Metrics
+        self.profiled = 0
+        self.flagged = 0
+
+    def install(self, engine):
+        """Attach the cursor listeners to an (async) engine"""
+        target = getattr(engine, "sync_engine", engine)
+        event.listen(target, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(target, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None and current_profile.get() is not None:
+            context._profile_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        started = getattr(context, "_profile_started", None)
+        if profile is None or started is None:
+            return
+        seconds = time.perf_counter() - started
+        shape = statement_shape(statement)
+        profile.add(shape, seconds)
+
+        milliseconds = seconds * 1000
+        if milliseconds >= self.slow_ms:
+            plan = None
+            if self.explain and not executemany and statement.lstrip()[:6].upper() == "SELECT":
+                plan = self._explain(conn, statement, parameters)
+            profile.slow.append((shape, milliseconds, plan))
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters) -> Optional[str]:
+        """Plan for a slow SELECT, run on a separate cursor so the result isn't disturbed"""
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+        except Exception as e:
+            return f"EXPLAIN failed: {str(e)}"
+        finally:
+            cursor.close()
+
+    def flags(self, profile: RequestProfile) -> list[str]:
+        flags = []
+        if profile.count > self.max_queries:
+            flags.append("query_count")
+        if profile.db_seconds * 1000 > self.max_db_ms:
+            flags.append("db_time")
+        if profile.repeated(self.repeat_threshold):
+            flags.append("n+1")
+        if profile.slow:
+            flags.append("slow")
+        return flags
+
+    def summary(self, profile: RequestProfile) -> str:
+        """Compact form for the response header"""
+        flags = self.flags(profile)
+        summary = f"queries={profile.count}; db_ms={profile.db_seconds * 1000:.2f}"
+        return summary + (f"; flags={','.join(flags)}" if flags else "")
+
+    def report(self, profile: RequestProfile):
+        self.profiled += 1
+        flags = self.flags(profile)
+        if not flags:
+            logger.info(f"SQL profile {profile.label}: {self.summary(profile)}")
+            return
+
+        self.flagged += 1
+        lines = [f"SQL profile {profile.label}: {self.summary(profile)}"]
+        for shape, count in profile.repeated(self.repeat_threshold):
+            lines.append(f"  repeated x{count}: {shape[:300]}")
+        for shape, milliseconds, plan in profile.slow:
+            lines.append(f"  slow {milliseconds:.1f}ms: {shape[:300]}")
+            if plan:
+                lines.extend(f"    {line}" for line in plan.splitlines())
+        logger.warning("\n".join(lines))
+
+    def stats(self) -> dict:
+        return {
+            "profiled": self.profiled,
+            "flagged": self.flagged,
+        }
+
+
+sql_profiler = SqlProfiler(
+    max_queries=settings.SQL_PROFILER_MAX_QUERIES,
+    max_db_ms=settings.SQL_PROFILER_MAX_DB_MS,
+    slow_ms=settings.SQL_PROFILER_SLOW_MS,
+    repeat_threshold=settings.SQL_PROFILER_REPEAT_THRESHOLD,
+    explain=settings.SQL_PROFILER_EXPLAIN
+)
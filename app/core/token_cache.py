@@ -0,0 +1,84 @@
+"""
+Verified token cache
+Keeps decoded payloads of recently verified tokens so repeated requests
+with the same bearer token skip the JWT decode and signature check
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+def _token_key(token: str) -> bytes:
+    """Digest used as cache key so raw tokens are never kept in memory"""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class TokenCache:
+    """Bounded LRU cache of verified token payloads, expiring at the token's exp"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return the cached payload for a token, or None on miss or expiry"""
+        key = _token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: dict):
+        """Cache a verified payload until its exp claim"""
+        if self.max_size <= 0:
+            return
+
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+
+        key = _token_key(token)
+        self._entries[key] = (exp, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def revoke(self, token: str):
+        """Drop a token from the cache"""
+        self._entries.pop(_token_key(token), None)
+
+    def clear(self):
+        """Drop every cached token"""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Cache size and hit/miss counters"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
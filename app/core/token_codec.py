@@ -0,0 +1,179 @@
+"""
+Fast-path JWT codecs
+HS256 tokens are wire-compatible with python-jose; EdDSA/RS256 tokens carry
+a kid header resolved through an in-memory key index. Neither goes through
+python-jose's generic JWS/JWK machinery on the hot path.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from typing import Optional
+
+# Tokens longer than this are rejected before any decoding or crypto
+MAX_TOKEN_LENGTH = 8192
+
+
+def b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _json_dumps(value: dict) -> bytes:
+    # Same separators python-jose uses so encoded segments are byte-identical
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def split_token(token: str) -> Optional[tuple[bytes, bytes, bytes, bytes]]:
+    """Split into (signing input, header, payload, decoded signature), or None if malformed"""
+    # Fast reject for malformed input before touching any crypto
+    if not isinstance(token, str) or len(token) > MAX_TOKEN_LENGTH or token.count(".") != 2:
+        return None
+    try:
+        raw = token.encode("ascii")
+    except UnicodeEncodeError:
+        return None
+
+    signing_input, _, signature_segment = raw.rpartition(b".")
+    header_segment, _, payload_segment = signing_input.partition(b".")
+    if not header_segment or not payload_segment or not signature_segment:
+        return None
+    try:
+        signature = b64url_decode(signature_segment)
+    except (binascii.Error, ValueError):
+        return None
+    return signing_input, header_segment, payload_segment, signature
+
+
+def decode_header(header_segment: bytes) -> Optional[dict]:
+    try:
+        header = json.loads(b64url_decode(header_segment))
+    except (binascii.Error, ValueError):
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def decode_claims(payload_segment: bytes) -> Optional[dict]:
+    """Decode the payload and apply the registered-claim checks"""
+    try:
+        claims = json.loads(b64url_decode(payload_segment))
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(claims, dict) or not claims_valid(claims):
+        return None
+    return claims
+
+
+def claims_valid(claims: dict) -> bool:
+    """Registered-claim checks matching python-jose's defaults"""
+    now = time.time()
+    for name in ("exp", "nbf", "iat"):
+        value = claims.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            return False
+
+    exp = claims.get("exp")
+    if exp is not None and exp < now:
+        return False
+    nbf = claims.get("nbf")
+    if nbf is not None and nbf > now:
+        return False
+    sub = claims.get("sub")
+    if sub is not None and not isinstance(sub, str):
+        return False
+    # python-jose rejects audience-restricted tokens when no audience is expected
+    if "aud" in claims:
+        return False
+    return True
+
+
+class HS256TokenCodec:
+    """Encode and verify HS256 JWTs with a precomputed HMAC key and header"""
+
+    algorithm = "HS256"
+
+    def __init__(self, secret: str):
+        # HMAC key schedule computed once; copy() is cheaper than hmac.new() per token
+        self._hmac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+        header = json.dumps({"alg": self.algorithm, "typ": "JWT"}, separators=(",", ":"), sort_keys=True)
+        self._header_segment = b64url_encode(header.encode("utf-8"))
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: dict) -> str:
+        """Sign a claims dict; exp/iat/nbf must already be integer timestamps"""
+        signing_input = self._header_segment + b"." + b64url_encode(_json_dumps(claims))
+        return (signing_input + b"." + b64url_encode(self._sign(signing_input))).decode("ascii")
+
+    def verify(self, token: str) -> Optional[dict]:
+        """Return the claims of a valid, unexpired token or None"""
+        parts = split_token(token)
+        if parts is None:
+            return None
+        signing_input, header_segment, payload_segment, signature = parts
+
+        if header_segment != self._header_segment and not self._header_allowed(header_segment):
+            return None
+        if not hmac.compare_digest(signature, self._sign(signing_input)):
+            return None
+        return decode_claims(payload_segment)
+
+    def _header_allowed(self, header_segment: bytes) -> bool:
+        # Headers from other encoders may differ in key order or extra fields
+        header = decode_header(header_segment)
+        return header is not None and header.get("alg") == self.algorithm
+
+
+def _header_segment(header: dict) -> bytes:
+    return b64url_encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+
+
+class AsymmetricTokenCodec:
+    """Sign with the key ring's active key; verify against any key by kid in O(1)"""
+
+    def __init__(self, keyring, legacy_codec: Optional[HS256TokenCodec] = None):
+        self.keyring = keyring
+        # Optional HS256 codec so tokens issued before the switch stay valid until they expire
+        self.legacy_codec = legacy_codec
+        # Our own encoders emit these exact header bytes, so most lookups skip JSON parsing
+        self._keys_by_header = {
+            _header_segment({"alg": key.algorithm, "kid": kid, "typ": "JWT"}): key
+            for kid, key in keyring.keys.items()
+        }
+        self._active_header_segment = _header_segment(
+            {"alg": keyring.active.algorithm, "kid": keyring.active.kid, "typ": "JWT"}
+        )
+
+    def encode(self, claims: dict) -> str:
+        signing_input = self._active_header_segment + b"." + b64url_encode(_json_dumps(claims))
+        signature = self.keyring.active.sign(signing_input)
+        return (signing_input + b"." + b64url_encode(signature)).decode("ascii")
+
+    def verify(self, token: str) -> Optional[dict]:
+        parts = split_token(token)
+        if parts is None:
+            return None
+        signing_input, header_segment, payload_segment, signature = parts
+
+        key = self._keys_by_header.get(header_segment)
+        if key is None:
+            header = decode_header(header_segment)
+            if header is None:
+                return None
+            if header.get("alg") == HS256TokenCodec.algorithm and "kid" not in header:
+                return self.legacy_codec.verify(token) if self.legacy_codec else None
+            key = self.keyring.get(header.get("kid"))
+            if key is None or header.get("alg") != key.algorithm:
+                return None
+
+        if not key.verify(signature, signing_input):
+            return None
+        return decode_claims(payload_segment)
@@ -0,0 +1,51 @@
+"""
+Traffic capture
+Sanitized per-request records (route, timing, status and keyed hashes of
+the identifiers involved) appended to a JSONL file through a write-behind
+buffer, for benchmarks/replay.py. Passwords, tokens, query strings and raw
+identifiers are never written.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+
+from app.core.config import settings
+from app.core.write_behind import WriteBehindBuffer
+
+# Request body fields whose values are kept, as hashes; every other field is kept by name only
+IDENTIFIER_FIELDS = ("email", "username")
+
+if settings.TRAFFIC_CAPTURE_ENABLED and not settings.TRAFFIC_CAPTURE_HASH_KEY:
+    raise ValueError("TRAFFIC_CAPTURE_HASH_KEY must be set when TRAFFIC_CAPTURE_ENABLED is on")
+_hash_key = settings.TRAFFIC_CAPTURE_HASH_KEY.encode("utf-8")
+
+
+def identifier_hash(value: str) -> str:
+    """Keyed, case-insensitive hash of an email or username
+
+    Stable across requests so replay can tell users apart, but not
+    reversible by guessing without the key.
+    """
+    return hmac.new(_hash_key, value.lower().encode("utf-8"), hashlib.sha256).hexdigest()[:16]
+
+
+def _append(path: str, lines: list[str]):
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(lines)
+
+
+async def write_capture(records: list[dict]):
+    """Append one batch of records as JSON lines"""
+    lines = [json.dumps(record, separators=(",", ":")) + "\n" for record in records]
+    # One small append per batch; off the loop so a slow disk never stalls requests
+    await asyncio.to_thread(_append, settings.TRAFFIC_CAPTURE_PATH, lines)
+
+
+traffic_capture = WriteBehindBuffer(
+    write_capture,
+    max_queue=settings.TRAFFIC_CAPTURE_QUEUE_SIZE,
+    batch_size=500,
+    flush_interval=1.0,
+    overflow="drop"
+)
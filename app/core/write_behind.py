@@ -0,0 +1,195 @@
+"""
+Write-behind buffer
+Callers enqueue records without waiting; a background task flushes them in
+batches when either the batch size or the flush interval is reached
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Bounded in-process queue flushed in batches by a single background task"""
+
+    def __init__(
+        self,
+        flush: Callable[[list[dict]], Awaitable[None]],
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: str = "drop",
+        spill_path: Optional[str] = None
+    ):
+        if overflow not in ("drop", "spill"):
+            raise ValueError(f"Unknown write-behind overflow mode: {overflow}")
+        if overflow == "spill" and not spill_path:
+            raise ValueError("Spill overflow needs a spill path")
+        self.flush = flush
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Records taken off the queue but not yet handed to flush, and the flush in progress
+        self._batch: list[dict] = []
+        self._inflight: Optional[asyncio.Future] = None
+        # Overflow waiting to be appended to the spill file, and the task appending it
+        self._spill_pending: list[dict] = []
+        self._spill_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.failed = 0
+        self.batches = 0
+
+    def start(self):
+        """Start the flusher on the running loop"""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, record: dict) -> bool:
+        """Enqueue a record without blocking; returns False if it was dropped or spilled"""
+        if self._queue is None:
+            # Not started (e.g. scripts and tests without the app lifespan)
+            self._overflow([record])
+            return False
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._overflow([record])
+            return False
+        self.submitted += 1
+        return True
+
+    def _overflow(self, records: list[dict]):
+        """Spill or drop records the flusher can't take; never blocks the caller"""
+        if self.overflow == "spill" and len(self._spill_pending) < self.max_queue:
+            self._spill_pending.extend(records)
+            if self._spill_task is None:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    # No event loop (plain scripts): nothing to stall, write it now
+                    self._spill_now()
+                    return
+                # File I/O goes to a thread, batched, so a saturated buffer never adds disk
+                # writes to the request path
+                self._spill_task = loop.create_task(self._spill())
+            return
+        self.dropped += len(records)
+
+    def _append_spill(self, records: list[dict]):
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record, default=str) + "\n" for record in records)
+
+    def _spill_now(self):
+        records, self._spill_pending = self._spill_pending, []
+        try:
+            self._append_spill(records)
+            self.spilled += len(records)
+        except OSError as e:
+            logger.error(f"Write-behind spill failed: {str(e)}")
+            self.dropped += len(records)
+
+    async def _spill(self):
+        try:
+            while self._spill_pending:
+                records, self._spill_pending = self._spill_pending, []
+                try:
+                    await asyncio.to_thread(self._append_spill, records)
+                    self.spilled += len(records)
+                except OSError as e:
+                    logger.error(f"Write-behind spill failed: {str(e)}")
+                    self.dropped += len(records)
+        finally:
+            self._spill_task = None
+
+    async def _next_batch(self):
+        """Wait for a first record, then collect more until the batch is full or the interval ends"""
+        self._batch.append(await self._queue.get())
+        deadline = time.monotonic() + self.flush_interval
+        while len(self._batch) < self.batch_size:
+            if not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            # asyncio.wait, not wait_for: before Python 3.12 wait_for can swallow the
+            # cancel from drain() when its own timeout fires at the same moment
+            getter = asyncio.ensure_future(self._queue.get())
+            try:
+                await asyncio.wait({getter}, timeout=timeout)
+            finally:
+                received = getter.done() and not getter.cancelled()
+                if received:
+                    self._batch.append(getter.result())
+                else:
+                    getter.cancel()
+            if not received:
+                break
+
+    async def _write(self, batch: list[dict]):
+        try:
+            await self.flush(batch)
+        except Exception as e:
+            logger.error(f"Write-behind flush of {len(batch)} records failed: {str(e)}")
+            self.failed += len(batch)
+            self._overflow(batch)
+            return
+        self.written += len(batch)
+        self.batches += 1
+
+    async def _run(self):
+        while True:
+            await self._next_batch()
+            batch, self._batch = self._batch, []
+            # Shielded so a shutdown cancel never interrupts a half-written batch
+            self._inflight = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    async def drain(self):
+        """Stop the flusher and write everything still queued"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._inflight is not None:
+            await self._inflight
+            self._inflight = None
+
+        remaining, self._batch = self._batch, []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        # Anything submitted from here on overflows instead of waiting for a flusher that's gone
+        self._queue = None
+        for start in range(0, len(remaining), self.batch_size):
+            await self._write(remaining[start:start + self.batch_size])
+        if self._spill_task is not None:
+            await self._spill_task
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "submitted": self.submitted,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "spill_pending": len(self._spill_pending),
+            "failed": self.failed,
+        }
@@ -0,0 +1,137 @@
+"""
+In-process benchmarks for the auth API hot paths
+Drives the FastAPI app from main.py over ASGI against a SQLite stand-in or
+a local Postgres database
+"""
+import asyncio
+import uuid
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.api.v1.auth.router as auth_router_module
+import app.api.v1.auth.services as auth_services
+from app.api.Dependences import Base, get_db, get_read_db
+from app.core.middleware.authorizeMiddleware import AuthorizeMiddleware
+from app.core.middleware.metricsMiddleware import MetricsMiddleware
+from app.core.responses import FastJSONResponse
+from main import app
+
+from benchmarks.common import run_concurrent
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./bench.sqlite"
+PASSWORD = "correct horse battery"
+PROTECTED_PATH = "/bench/protected"
+
+
+async def protected_probe():
+    """Minimal handler behind AuthorizeMiddleware"""
+    return {"ok": True}
+
+
+def build_probe_app() -> FastAPI:
+    """The probe behind main.app's auth and metrics middleware, on its own app
+
+    Keeps the shipped app's routes untouched while measuring the same
+    per-request middleware work.
+    """
+    probe_app = FastAPI(default_response_class=FastJSONResponse)
+    probe_app.add_api_route(PROTECTED_PATH, protected_probe, methods=["GET"])
+    probe_app.add_middleware(AuthorizeMiddleware)
+    probe_app.add_middleware(MetricsMiddleware)
+    return probe_app
+
+
+def install_database(database_url: str):
+    """Point the app's session dependencies at the benchmark database"""
+    engine = create_async_engine(database_url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def bench_db():
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = bench_db
+    app.dependency_overrides[get_read_db] = bench_db
+    # Login lookups open their own sessions rather than using the dependency
+    auth_services.ReadSessionLocal = session_factory
+    auth_services.AsyncSessionLocal = session_factory
+    return engine
+
+
+async def run(
+    database_url: str = DEFAULT_DATABASE_URL,
+    login_iterations: int = 50,
+    register_iterations: int = 50,
+    protected_iterations: int = 2000,
+    concurrency: int = 4
+) -> dict:
+    engine = install_database(database_url)
+    # The benchmark hammers a few accounts on purpose; the login limiter would turn that into 429s
+    auth_router_module.login_ip_limiter = None
+    auth_router_module.login_identifier_limiter = None
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    run_id = uuid.uuid4().hex[:8]
+    # One account per concurrent worker: logins sharing a password would be coalesced
+    # into one bcrypt verify by the login single-flight and understate its cost
+    login_users = [
+        {"username": f"bench_{run_id}_w{n}", "email": f"bench_{run_id}_w{n}@example.com", "password": PASSWORD}
+        for n in range(concurrency)
+    ]
+    idle_users = asyncio.Queue()
+
+    transport = httpx.ASGITransport(app=app)
+    probe_transport = httpx.ASGITransport(app=build_probe_app())
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client, \
+                httpx.AsyncClient(transport=probe_transport, base_url="http://bench") as probe_client:
+            for login_user in login_users:
+                response = await client.post("/auth/register", json=login_user)
+                response.raise_for_status()
+                idle_users.put_nowait(login_user)
+            response = await client.post("/auth/login", json={"email": login_users[0]["email"], "password": PASSWORD})
+            response.raise_for_status()
+            auth_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            async def login(i: int) -> bool:
+                # Checked out for the call, so no two in-flight logins share an account
+                login_user = idle_users.get_nowait()
+                try:
+                    response = await client.post(
+                        "/auth/login",
+                        json={"email": login_user["email"], "password": PASSWORD}
+                    )
+                finally:
+                    idle_users.put_nowait(login_user)
+                return response.status_code == 200
+
+            async def register(i: int) -> bool:
+                response = await client.post("/auth/register", json={
+                    "username": f"bench_{run_id}_{i}",
+                    "email": f"bench_{run_id}_{i}@example.com",
+                    "password": PASSWORD,
+                })
+                return response.status_code == 200
+
+            async def protected(i: int) -> bool:
+                response = await probe_client.get(PROTECTED_PATH, headers=auth_headers)
+                return response.status_code == 200
+
+            results["api_login"] = await run_concurrent(login, login_iterations, concurrency)
+            results["api_register"] = await run_concurrent(register, register_iterations, concurrency)
+            results["api_protected"] = await run_concurrent(protected, protected_iterations, concurrency)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        await engine.dispose()
+
+    return results
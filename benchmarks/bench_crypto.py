@@ -0,0 +1,20 @@
+"""
+Microbenchmarks for the password and token primitives in app.core.security
+"""
+from app.core.security import create_access_token, hash_password, verify_password, verify_token
+
+from benchmarks.common import time_calls
+
+PASSWORD = "correct horse battery"
+CLAIMS = {"sub": "bench@example.com", "username": "bench", "user_id": 1}
+
+
+def run(bcrypt_iterations: int = 10, token_iterations: int = 5000) -> dict:
+    hashed = hash_password(PASSWORD)
+    token = create_access_token(data=CLAIMS)
+    return {
+        "hash_password": time_calls(hash_password, bcrypt_iterations, PASSWORD),
+        "verify_password": time_calls(verify_password, bcrypt_iterations, PASSWORD, hashed),
+        "create_access_token": time_calls(create_access_token, token_iterations, CLAIMS),
+        "verify_token": time_calls(verify_token, token_iterations, token),
+    }
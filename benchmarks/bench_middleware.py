@@ -0,0 +1,124 @@
+"""
+Microbenchmark: AuthorizeMiddleware vs the previous BaseHTTPMiddleware version
+Usage: python -m benchmarks.bench_middleware [--requests N]
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import HTTPException, Request, Response
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.status import HTTP_401_UNAUTHORIZED
+
+from app.core.middleware.authorizeMiddleware import AuthorizeMiddleware, public_routes
+from app.core.security import create_access_token, verify_token
+from app.core.token_cache import token_cache
+
+
+class LegacyAuthorizeMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation this benchmark compares against (minus its print)"""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        path = request.url.path
+        if any(path.startswith(route) for route in public_routes):
+            return await call_next(request)
+
+        token = request.headers.get("Authorization")
+        if not token:
+            raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Authorization token missing")
+        if token.startswith("Bearer "):
+            token = token[7:]
+
+        payload = verify_token(token)
+        if not payload:
+            raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+        return await call_next(request)
+
+
+async def ok(request):
+    return PlainTextResponse("ok")
+
+
+def build_app(middleware_class) -> Starlette:
+    return Starlette(
+        routes=[Route("/auth/ping", ok), Route("/items", ok)],
+        middleware=[Middleware(middleware_class)],
+    )
+
+
+async def call(app, path: str, headers: list) -> int:
+    """Drive one request through the ASGI app without any network I/O"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app, path: str, headers: list, requests: int) -> float:
+    """Return requests per second for sequential requests to one path"""
+    # Warm up routing, caches and lazy imports
+    for _ in range(100):
+        await call(app, path, headers)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        status = await call(app, path, headers)
+    elapsed = time.perf_counter() - start
+    assert status == 200, f"unexpected status {status} for {path}"
+    return requests / elapsed
+
+
+async def run(requests: int):
+    token = create_access_token(data={"sub": "bench@example.com", "username": "bench", "user_id": 1})
+    auth_headers = [(b"authorization", f"Bearer {token}".encode())]
+
+    legacy = build_app(LegacyAuthorizeMiddleware)
+    current = build_app(AuthorizeMiddleware)
+
+    cases = [
+        ("public route", "/auth/ping", []),
+        ("protected route", "/items", auth_headers),
+    ]
+    print(f"{'case':<18}{'legacy req/s':>15}{'asgi req/s':>15}{'speedup':>10}")
+    for name, path, headers in cases:
+        token_cache.clear()
+        legacy_rps = await measure(legacy, path, headers, requests)
+        current_rps = await measure(current, path, headers, requests)
+        print(f"{name:<18}{legacy_rps:>15,.0f}{current_rps:>15,.0f}{current_rps / legacy_rps:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
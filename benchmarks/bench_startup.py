@@ -0,0 +1,103 @@
+"""
+Cold-start benchmark: time to import `main` and time until the first
+response, each measured in a fresh interpreter
+Usage: python -m benchmarks.bench_startup [--runs 5] [--budget-ms 1500] [--warm]
+
+Exits non-zero when the median time to first response exceeds the budget.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import print_table, summarize
+
+# Runs in the child; talks ASGI directly so no HTTP client is imported into the measurement
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def first_response():
+    messages = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        messages.append(message)
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/.well-known/jwks.json",
+        "raw_path": b"/.well-known/jwks.json", "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    async with main.app.router.lifespan_context(main.app):
+        await main.app(scope, receive, send)
+        ready = time.perf_counter()
+    return messages[0]["status"], ready
+
+status, ready = asyncio.run(first_response())
+print(json.dumps({"import": imported - start, "first_response": ready - start, "status": status}))
+"""
+
+
+def measure_once(warm: bool = False) -> dict:
+    env = dict(os.environ)
+    if not warm:
+        env.update({"COLD_START": "true", "ADMIN_BOOTSTRAP": "skip"})
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        capture_output=True, text=True, env=env, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int = 5, warm: bool = False) -> dict:
+    imports = []
+    first_responses = []
+    errors = 0
+    for _ in range(runs):
+        sample = measure_once(warm)
+        imports.append(sample["import"])
+        first_responses.append(sample["first_response"])
+        if sample["status"] != 200:
+            errors += 1
+    return {
+        "startup_import": summarize(imports, sum(imports)),
+        "startup_first_response": summarize(first_responses, sum(first_responses), errors),
+    }
+
+
+def over_budget(results: dict, budget_ms: float) -> list[str]:
+    """Describe the time to first response if its p50 is over the budget"""
+    result = results["startup_first_response"]
+    if result["p50_ms"] <= budget_ms:
+        return []
+    return [f"startup_first_response: p50 {result['p50_ms']:.1f}ms over the {budget_ms:.0f}ms budget"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure worker cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0,
+                        help="maximum p50 time to first response")
+    parser.add_argument("--warm", action="store_true",
+                        help="measure the default warm startup instead of COLD_START")
+    args = parser.parse_args()
+
+    results = run(args.runs, args.warm)
+    print_table(results)
+
+    failures = over_budget(results, args.budget_ms)
+    if failures:
+        print("\nOVER BUDGET:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print(f"\nStartup within the {args.budget_ms:.0f}ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Benchmark: HS256TokenCodec vs python-jose for token signing and verification
+Usage: python -m benchmarks.bench_token [--iterations N]
+"""
+import argparse
+import time
+
+from jose import jwt
+
+from app.core.security import SECRET_KEY
+from app.core.token_codec import HS256TokenCodec
+
+from benchmarks.common import print_table, time_calls
+
+ALGORITHM = "HS256"
+CLAIMS = {"sub": "bench@example.com", "username": "bench", "user_id": 1}
+
+token_codec = HS256TokenCodec(SECRET_KEY)
+
+
+def jose_encode(claims: dict) -> str:
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def jose_verify(token: str) -> dict:
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def check_compatibility(claims: dict):
+    """Tokens must verify identically in both directions"""
+    jose_token = jose_encode(claims)
+    codec_token = token_codec.encode(claims)
+    assert jose_token == codec_token, "encoded tokens differ"
+    assert token_codec.verify(jose_token) == claims
+    assert jose_verify(codec_token) == claims
+    assert token_codec.verify(codec_token[:-2] + "xx") is None
+    assert token_codec.verify("not-a-token") is None
+
+
+def run(iterations: int = 20000) -> dict:
+    claims = {**CLAIMS, "exp": int(time.time()) + 1800}
+    check_compatibility(claims)
+    token = token_codec.encode(claims)
+    malformed = "x" * 200
+
+    return {
+        "jose_encode": time_calls(jose_encode, iterations, claims),
+        "codec_encode": time_calls(token_codec.encode, iterations, claims),
+        "jose_verify": time_calls(jose_verify, iterations, token),
+        "codec_verify": time_calls(token_codec.verify, iterations, token),
+        "codec_reject_malformed": time_calls(token_codec.verify, iterations, malformed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    print_table(results)
+    for operation in ("encode", "verify"):
+        speedup = results[f"jose_{operation}"]["mean_ms"] / results[f"codec_{operation}"]["mean_ms"]
+        print(f"{operation}: {speedup:.1f}x faster than python-jose")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Shared helpers for the benchmark suite: timing summaries, result files and
+baseline comparison
+"""
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+
+def percentile(sorted_samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples: list[float], elapsed: float, errors: int = 0) -> dict:
+    """Latency distribution (milliseconds) and throughput for one benchmark"""
+    ordered = sorted(samples)
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "throughput_per_s": len(samples) / elapsed if elapsed else 0.0,
+    }
+
+
+def time_calls(fn, iterations: int, *args) -> dict:
+    """Time a synchronous callable one call at a time"""
+    fn(*args)
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - call_start)
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def run_concurrent(send, iterations: int, concurrency: int) -> dict:
+    """Call send(i) for i in range(iterations) from concurrent workers
+
+    send is an async callable returning True on success.
+    """
+    samples = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < iterations:
+            index = next_index
+            next_index += 1
+            call_start = time.perf_counter()
+            ok = await send(index)
+            samples.append(time.perf_counter() - call_start)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - start, errors)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(path: str, results: dict):
+    """Write results with enough metadata to compare runs across commits"""
+    document = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a description of every benchmark whose p50 regressed beyond tolerance"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("p50_ms"):
+            continue
+        ratio = current["p50_ms"] / previous["p50_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{name}: p50 {previous['p50_ms']:.3f}ms -> {current['p50_ms']:.3f}ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def print_table(results: dict):
+    print(f"{'benchmark':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>12}{'errors':>8}")
+    for name, r in results.items():
+        print(
+            f"{name:<28}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+            f"{r['throughput_per_s']:>12,.1f}{r['errors']:>8}"
+        )
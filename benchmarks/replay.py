@@ -0,0 +1,318 @@
+"""
+Replay captured traffic (TRAFFIC_CAPTURE_ENABLED) against a build
+Requests are re-issued at their original spacing, or N times faster, with
+bounded concurrency, and latency and error rates are reported per route.
+Captured identifier hashes become synthetic users, registered up front
+unless the capture contains their registration; a login keeps its original
+outcome by sending the right password only if it succeeded originally.
+Usage: python -m benchmarks.replay traffic_capture.jsonl [--speed 1.0] [--concurrency 16]
+                                   [--base-url URL | --database-url URL] [--output results.json]
+Needs the extra packages in requirements-bench.txt (pip install -r requirements-bench.txt).
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+import uuid
+from typing import Optional
+
+import httpx
+
+from benchmarks.common import print_table, summarize, write_results
+
+PASSWORD = "replay password 1"
+WRONG_PASSWORD = "wrong password 1"
+
+
+def load_capture(path: str, limit: Optional[int] = None) -> list[dict]:
+    """Captured records in request order; torn or blank lines are skipped"""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    records.sort(key=lambda record: record["ts"])
+    return records[:limit] if limit else records
+
+
+class Identity:
+    """Synthetic stand-in for one captured user, with the tokens replay has obtained for it"""
+
+    def __init__(self, name: str):
+        self.username = name
+        self.email = f"{name}@example.com"
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+        # One request at a time per user, in capture order, as a real client would
+        self.lock = asyncio.Lock()
+
+
+class Identities:
+    """Maps captured identifier hashes onto synthetic users"""
+
+    def __init__(self, records: list[dict], run_id: str):
+        self.run_id = run_id
+        # A registration links its username hash to its email hash, so later
+        # logins by either resolve to the same user
+        self.aliases: dict[str, str] = {}
+        for record in records:
+            identifiers = record.get("identifiers", {})
+            if record["route"] == "/auth/register" and "email" in identifiers and "username" in identifiers:
+                self.aliases.setdefault(identifiers["username"], identifiers["email"])
+        self.users: dict[str, Identity] = {}
+
+    def key(self, record: dict) -> Optional[str]:
+        identifiers = record.get("identifiers", {})
+        if "email" in identifiers:
+            return identifiers["email"]
+        if "username" in identifiers:
+            return self.aliases.get(identifiers["username"], identifiers["username"])
+        # Bearer subjects are emails, hashed the same way
+        return record.get("subject")
+
+    def get(self, record: dict) -> Optional[Identity]:
+        key = self.key(record)
+        if key is None:
+            return None
+        if key not in self.users:
+            self.users[key] = Identity(f"r{self.run_id}_{key[:12]}")
+        return self.users[key]
+
+    def with_refresh_token(self) -> Optional[Identity]:
+        """Any user holding a refresh token, for refresh/logout requests captured without an identifier"""
+        for identity in self.users.values():
+            if identity.refresh_token:
+                return identity
+        return None
+
+    def resolve(self, record: dict) -> Optional[Identity]:
+        identity = self.get(record)
+        if identity is None and record["route"] in ("/auth/refresh", "/auth/logout"):
+            return self.with_refresh_token()
+        return identity
+
+
+def build_request(record: dict, identity: Optional[Identity]) -> dict:
+    """The httpx request arguments that reproduce one captured request for a synthetic user"""
+    route = record["route"]
+    fields = record.get("fields", [])
+    request = {"method": record["method"], "url": record["path"]}
+
+    if route == "/auth/register" and identity is not None:
+        request["json"] = {"username": identity.username, "email": identity.email, "password": PASSWORD}
+    elif route == "/auth/login" and identity is not None:
+        body = {field: getattr(identity, field) for field in ("email", "username") if field in fields}
+        body["password"] = PASSWORD if record["status"] < 400 else WRONG_PASSWORD
+        request["json"] = body
+    elif route in ("/auth/refresh", "/auth/logout"):
+        token = identity.refresh_token if identity is not None else None
+        if record["status"] >= 400 or token is None:
+            token = "replay-invalid-token"
+        request["json"] = {"refresh_token": token} if "refresh_token" in fields or route == "/auth/refresh" else {}
+    elif fields:
+        request["json"] = {}
+
+    if identity is not None and identity.access_token and route != "/auth/login":
+        request["headers"] = {"Authorization": f"Bearer {identity.access_token}"}
+    return request
+
+
+async def seed(client: httpx.AsyncClient, records: list[dict], identities: Identities):
+    """Register (and log in, if they make authenticated calls) users whose registration wasn't captured"""
+    registered = set()
+    needs_token = set()
+    for record in records:
+        key = identities.key(record)
+        if key is None:
+            continue
+        if record["route"] == "/auth/register" and key not in identities.users:
+            registered.add(key)
+        if record.get("subject") and key not in registered:
+            needs_token.add(key)
+        identities.get(record)
+
+    for key, identity in identities.users.items():
+        if key in registered:
+            continue
+        response = await client.post("/auth/register", json={
+            "username": identity.username, "email": identity.email, "password": PASSWORD
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f"Seeding {identity.username} failed: {response.status_code} {response.text}")
+        if key in needs_token:
+            response = await client.post("/auth/login", json={"email": identity.email, "password": PASSWORD})
+            response.raise_for_status()
+            _keep_tokens(identity, response)
+
+
+def _keep_tokens(identity: Optional[Identity], response: httpx.Response):
+    if identity is None or response.status_code != 200:
+        return
+    try:
+        body = response.json()
+    except ValueError:
+        return
+    if isinstance(body, dict) and "access_token" in body:
+        identity.access_token = body["access_token"]
+        identity.refresh_token = body.get("refresh_token")
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    records: list[dict],
+    speed: float = 1.0,
+    concurrency: int = 16
+) -> tuple[dict, dict]:
+    """Re-issue records on their original schedule scaled by speed (0 = as fast as possible)
+
+    Returns latency summaries per route and replay quality figures: status
+    mismatches against the capture, and how far dispatch fell behind schedule.
+    """
+    identities = Identities(records, uuid.uuid4().hex[:6])
+    await seed(client, records, identities)
+
+    samples: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    mismatches: dict[str, int] = {}
+    lag = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def send(record: dict):
+        label = f"{record['method']} {record['route']}"
+        try:
+            identity = identities.resolve(record)
+            async with identity.lock if identity is not None else contextlib.nullcontext():
+                request = build_request(record, identity)
+                call_start = time.perf_counter()
+                try:
+                    response = await client.request(**request)
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = 599
+                samples.setdefault(label, []).append(time.perf_counter() - call_start)
+                if status >= 500:
+                    errors[label] = errors.get(label, 0) + 1
+                if status // 100 != record["status"] // 100:
+                    mismatches[label] = mismatches.get(label, 0) + 1
+                elif record["route"] == "/auth/logout" and identity is not None:
+                    identity.access_token = identity.refresh_token = None
+                else:
+                    _keep_tokens(identity, response)
+        finally:
+            slots.release()
+
+    tasks = []
+    first = records[0]["ts"] if records else 0.0
+    start = time.perf_counter()
+    for record in records:
+        if speed > 0:
+            due = (record["ts"] - first) / speed
+            delay = due - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await slots.acquire()
+        if speed > 0:
+            # Dispatch later than scheduled means the target (or concurrency) can't keep up
+            lag.append(max(0.0, time.perf_counter() - start - (record["ts"] - first) / speed))
+        tasks.append(asyncio.create_task(send(record)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    results = {
+        label: summarize(route_samples, elapsed, errors.get(label, 0))
+        for label, route_samples in sorted(samples.items())
+    }
+    results["all"] = summarize(
+        [sample for route_samples in samples.values() for sample in route_samples],
+        elapsed,
+        sum(errors.values())
+    )
+    quality = {
+        "mismatches": mismatches,
+        "lag": summarize(lag, elapsed),
+    }
+    return results, quality
+
+
+async def run(
+    capture_path: str,
+    speed: float = 1.0,
+    concurrency: int = 16,
+    base_url: Optional[str] = None,
+    database_url: Optional[str] = None,
+    limit: Optional[int] = None,
+    keep_rate_limits: bool = False
+) -> tuple[dict, dict]:
+    records = load_capture(capture_path, limit)
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            return await replay(client, records, speed, concurrency)
+
+    # In-process: the app from main.py over ASGI, as in bench_api
+    import app.api.v1.auth.router as auth_router_module
+    from app.api.Dependences import Base, get_db, get_read_db
+    from benchmarks.bench_api import DEFAULT_DATABASE_URL, install_database
+    from main import app
+
+    engine = install_database(database_url or DEFAULT_DATABASE_URL)
+    if not keep_rate_limits:
+        # Replayed faster than captured, every user would hit the login limiter
+        auth_router_module.login_ip_limiter = None
+        auth_router_module.login_identifier_limiter = None
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+            return await replay(client, records, speed, concurrency)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured traffic and report latency per route")
+    parser.add_argument("capture", help="JSONL file written by the traffic capture middleware")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="multiple of the captured rate (2 = twice as fast, 0 = no pacing)")
+    parser.add_argument("--concurrency", type=int, default=16, help="maximum requests in flight")
+    parser.add_argument("--base-url", default=None, help="replay against a running server instead of in-process")
+    parser.add_argument("--database-url", default=None, help="database for the in-process app")
+    parser.add_argument("--limit", type=int, default=None, help="replay only the first N records")
+    parser.add_argument("--keep-rate-limits", action="store_true",
+                        help="leave the login rate limiters on for the in-process app")
+    parser.add_argument("--output", default=None, help="write results in the benchmarks.run format")
+    args = parser.parse_args()
+
+    results, quality = asyncio.run(run(
+        args.capture,
+        speed=args.speed,
+        concurrency=args.concurrency,
+        base_url=args.base_url,
+        database_url=args.database_url,
+        limit=args.limit,
+        keep_rate_limits=args.keep_rate_limits
+    ))
+
+    print_table(results)
+    print()
+    print(f"{'route':<28}{'error rate':>12}{'mismatch rate':>16}")
+    for label, r in results.items():
+        mismatched = sum(quality["mismatches"].values()) if label == "all" else quality["mismatches"].get(label, 0)
+        count = r["count"] or 1
+        print(f"{label:<28}{r['errors'] / count:>12.2%}{mismatched / count:>16.2%}")
+    if args.speed > 0:
+        lag = quality["lag"]
+        print(f"\nDispatch lag behind schedule: p50 {lag['p50_ms']:.1f}ms, p99 {lag['p99_ms']:.1f}ms")
+
+    if args.output:
+        write_results(args.output, results)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
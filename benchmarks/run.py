@@ -0,0 +1,74 @@
+"""
+Benchmark suite for the auth hot paths
+Usage: python -m benchmarks.run [--output results.json] [--baseline previous.json]
+                                [--tolerance 0.25] [--database-url URL]
+                                [--startup-budget-ms 1500]
+
+Exits non-zero when any benchmark's p50 regresses past the tolerance
+relative to the baseline file, or when cold start exceeds its budget.
+Needs the extra packages in requirements-bench.txt (pip install -r requirements-bench.txt).
+"""
+import argparse
+import asyncio
+import sys
+
+from benchmarks import bench_api, bench_crypto, bench_serialization, bench_startup
+from benchmarks.common import compare, load_results, print_table, write_results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the auth hot paths")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=None, help="results file from an earlier commit")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p50 slowdown relative to the baseline (0.25 = 25%%)")
+    parser.add_argument("--database-url", default=bench_api.DEFAULT_DATABASE_URL)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--bcrypt-iterations", type=int, default=10)
+    parser.add_argument("--token-iterations", type=int, default=5000)
+    parser.add_argument("--login-iterations", type=int, default=50)
+    parser.add_argument("--register-iterations", type=int, default=50)
+    parser.add_argument("--protected-iterations", type=int, default=2000)
+    parser.add_argument("--serialization-iterations", type=int, default=20000)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--startup-budget-ms", type=float, default=None,
+                        help="fail when the p50 cold start exceeds this many milliseconds")
+    args = parser.parse_args()
+
+    results = bench_crypto.run(args.bcrypt_iterations, args.token_iterations)
+    results.update(asyncio.run(bench_api.run(
+        database_url=args.database_url,
+        login_iterations=args.login_iterations,
+        register_iterations=args.register_iterations,
+        protected_iterations=args.protected_iterations,
+        concurrency=args.concurrency
+    )))
+    results.update(bench_serialization.run(args.serialization_iterations))
+    results.update(bench_startup.run(args.startup_runs))
+
+    print_table(results)
+    write_results(args.output, results)
+    print(f"\nResults written to {args.output}")
+
+    failed = False
+    if args.startup_budget_ms is not None:
+        failures = bench_startup.over_budget(results, args.startup_budget_ms)
+        if failures:
+            print("\nOVER BUDGET:")
+            for failure in failures:
+                print(f"  {failure}")
+            failed = True
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
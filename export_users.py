@@ -0,0 +1,71 @@
+"""
+CLI script to export all users as NDJSON or CSV
+Usage: python export_users.py users.ndjson [--format csv|ndjson] [--chunk-size 5000]
+                              [--after-id N | --resume]
+
+Rows are streamed from a server-side cursor in id order; --resume appends
+to an existing file after the last complete row it contains.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from app.core.bulk_export import resume_point, stream_users
+from app.core.database import get_engine, get_replica_engines
+
+
+async def main(args) -> int:
+    """Main entry point"""
+    file_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    after_id = args.after_id
+    started = False
+    if args.resume:
+        started, after_id = resume_point(args.path, file_format)
+
+    print("=" * 60)
+    print(f"Exporting users to {args.path}" + (f" after id {after_id}" if after_id is not None else ""))
+    print("=" * 60)
+
+    started_at = time.perf_counter()
+    written = 0
+    try:
+        with open(args.path, "ab" if args.resume else "wb") as f:
+            async for chunk in stream_users(
+                file_format,
+                after_id=after_id,
+                chunk_size=args.chunk_size,
+                # Appending to a file that already has a header or rows: no second CSV header
+                header=not started
+            ):
+                f.write(chunk)
+                written += len(chunk)
+    except Exception as e:
+        print("\n" + "=" * 60)
+        print(f"❌ Export failed: {str(e)}")
+        print("   Re-run with --resume to continue from the last complete row")
+        print("=" * 60)
+        return 1
+    finally:
+        for engine in [get_engine(), *get_replica_engines()]:
+            await engine.dispose()
+
+    print("\n" + "=" * 60)
+    print(f"✅ Wrote {written:,} bytes in {time.perf_counter() - started_at:.1f}s")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export all users")
+    parser.add_argument("path", help="output file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None,
+                        help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    resume = parser.add_mutually_exclusive_group()
+    resume.add_argument("--after-id", type=int, default=None, help="only export users with a greater id")
+    resume.add_argument("--resume", action="store_true", help="append after the last row already in the file")
+
+    logging.basicConfig(level=logging.INFO)
+    exit_code = asyncio.run(main(parser.parse_args()))
+    sys.exit(exit_code)
@@ -0,0 +1,59 @@
+"""
+CLI script to bulk import users from CSV or NDJSON
+Usage: python import_users.py users.csv [--format csv|ndjson] [--batch-size 5000]
+                              [--on-conflict skip|upsert] [--workers N]
+
+Each row needs username, email and password fields.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from app.core.bulk_import import import_users, read_rows
+from app.core.database import get_engine
+
+
+async def main(args) -> int:
+    """Main entry point"""
+    print("=" * 60)
+    print(f"Importing users from {args.path}")
+    print("=" * 60)
+
+    try:
+        report = await import_users(
+            read_rows(args.path, args.format),
+            batch_size=args.batch_size,
+            on_conflict=args.on_conflict,
+            workers=args.workers
+        )
+    except Exception as e:
+        print("\n" + "=" * 60)
+        print(f"❌ Import failed: {str(e)}")
+        print("=" * 60)
+        return 1
+    finally:
+        await get_engine().dispose()
+
+    print("\n" + "=" * 60)
+    print(f"✅ Read {report.read} rows in {report.elapsed:.1f}s ({report.rows_per_second:,.0f} rows/s)")
+    print(
+        f"   written: {report.written}  skipped: {report.skipped}  "
+        f"duplicates: {report.duplicates}  invalid: {report.invalid}"
+    )
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users")
+    parser.add_argument("path", help="CSV or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None,
+                        help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--on-conflict", choices=["skip", "upsert"], default="skip")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="hashing processes, defaults to CPU count")
+
+    logging.basicConfig(level=logging.INFO)
+    exit_code = asyncio.run(main(parser.parse_args()))
+    sys.exit(exit_code)
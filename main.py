@@ -1,8 +1,25 @@
+import asyncio
 from fastapi import FastAPI
 from app.api.v1.auth.router import auth_router
+from app.api.v1.user.router import user_router
+from app.api.v1.metrics.router import metrics_router
+from app.api.v1.jwks.router import jwks_router
 from app.core.middleware.authorizeMiddleware import AuthorizeMiddleware
+from app.core.middleware.metricsMiddleware import MetricsMiddleware
+from app.core.middleware.sqlProfilerMiddleware import SqlProfilerMiddleware
+from app.core.middleware.trafficCaptureMiddleware import TrafficCaptureMiddleware
 from contextlib import asynccontextmanager
-from app.core.init_db import init_default_admin
+from app.core.init_db import init_default_admin, warm_up_database
+from app.core.security import warm_up_crypto
+from app.core.hashing import password_hasher
+from app.api.v1.user.cache import user_cache
+from app.core.rate_limit import login_identifier_limiter, login_ip_limiter
+from app.core.revocation import revocation_store
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.api.v1.auth.services import load_revoked_tokens
+from app.api.v1.auth.events import login_events
+from app.core.traffic_capture import traffic_capture
 import logging
 
 # Configure logging
@@ -10,21 +27,74 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan events"""
+async def bootstrap_admin():
     try:
         await init_default_admin()
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan events"""
+    admin_bootstrap = None
+    if settings.ADMIN_BOOTSTRAP == "startup":
+        await bootstrap_admin()
+    elif settings.ADMIN_BOOTSTRAP == "background":
+        # Accept traffic right away; the admin row appears a moment later
+        admin_bootstrap = asyncio.create_task(bootstrap_admin())
+    elif settings.ADMIN_BOOTSTRAP != "skip":
+        raise ValueError(f"Unknown ADMIN_BOOTSTRAP mode: {settings.ADMIN_BOOTSTRAP}")
+    
+    # In cold-start mode the pool, bcrypt and token codec are built by the first request instead
+    if not settings.COLD_START:
+        try:
+            await warm_up_database()
+        except Exception as e:
+            logger.error(f"Failed to warm up database pool: {str(e)}")
+        warm_up_crypto()
+        
+        try:
+            await revocation_store.sync(load_revoked_tokens)
+        except Exception as e:
+            logger.error(f"Failed to load revoked tokens: {str(e)}")
+    login_events.start()
+    if settings.TRAFFIC_CAPTURE_ENABLED:
+        traffic_capture.start()
+    revocation_sync = asyncio.create_task(
+        revocation_store.run_sync(load_revoked_tokens, settings.REVOCATION_SYNC_SECONDS)
+    )
     
     yield
 
+    revocation_sync.cancel()
+    # Flush buffered audit events while the DB pool is still available
+    await login_events.drain()
+    await traffic_capture.drain()
+    if admin_bootstrap is not None:
+        admin_bootstrap.cancel()
+    password_hasher.shutdown()
+    if user_cache.backend is not None:
+        await user_cache.backend.close()
+    for limiter in (login_ip_limiter, login_identifier_limiter):
+        if limiter is not None:
+            await limiter.close()
+
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Add middleware
 app.add_middleware(AuthorizeMiddleware)
+if settings.TRAFFIC_CAPTURE_ENABLED:
+    # Just outside auth, so rejected requests are captured and accepted ones carry their subject
+    app.add_middleware(TrafficCaptureMiddleware, sample_rate=settings.TRAFFIC_CAPTURE_SAMPLE_RATE)
+app.add_middleware(MetricsMiddleware)
+if settings.SQL_PROFILER_ENABLED:
+    # Outermost, so auth and metrics work is inside the profiled span
+    app.add_middleware(SqlProfilerMiddleware, profile_all=settings.SQL_PROFILER_ALL)
 
 # Add routers
-app.include_router(auth_router)
\ No newline at end of file
+app.include_router(auth_router)
+app.include_router(user_router)
+app.include_router(metrics_router)
+app.include_router(jwks_router)
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+CLI script to run the API with preforked, pre-warmed workers
+Usage: python serve.py [--host 0.0.0.0] [--port 8000] [--workers N]
+                       [--max-requests N] [--max-requests-jitter N]
+
+Defaults come from the SERVER_* settings; --workers defaults to the CPU count.
+"""
+import argparse
+import logging
+import os
+import sys
+from app.core.config import settings
+from app.core.prefork import PreforkServer, default_workers
+
+
+def main(args) -> int:
+    """Main entry point"""
+    workers = args.workers or default_workers()
+
+    # Each worker has its own hashing pool; size it so all workers together
+    # use about one bcrypt thread per core instead of cores x cores
+    if settings.HASH_POOL_WORKERS == 0:
+        os.environ["HASH_POOL_WORKERS"] = str(max(1, default_workers() // workers))
+
+    server = PreforkServer(
+        app=args.app,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        graceful_timeout=args.graceful_timeout,
+        log_level=args.log_level
+    )
+    server.run()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the API with preforked workers")
+    parser.add_argument("--app", default="main:app")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS or None,
+                        help="worker processes, defaults to CPU count")
+    parser.add_argument("--max-requests", type=int, default=settings.SERVER_MAX_REQUESTS,
+                        help="recycle a worker after this many requests (0 disables)")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.SERVER_MAX_REQUESTS_JITTER)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT)
+    parser.add_argument("--log-level", default="info")
+
+    logging.basicConfig(level=logging.INFO)
+    exit_code = main(parser.parse_args())
+    sys.exit(exit_code)
@@ -0,0 +1,41 @@
+"""
+CLI script to grant or revoke admin rights for an existing user
+Usage: python set_admin.py admin@example.com [--revoke]
+"""
+import argparse
+import asyncio
+import sys
+from app.core.database import get_engine
+from app.core.init_db import set_admin
+
+
+async def main(args) -> int:
+    """Main entry point"""
+    action = "Revoking" if args.revoke else "Granting"
+    print("=" * 60)
+    print(f"{action} admin rights for {args.email}")
+    print("=" * 60)
+
+    try:
+        await set_admin(args.email, is_admin=not args.revoke)
+    except Exception as e:
+        print("\n" + "=" * 60)
+        print(f"❌ Failed: {str(e)}")
+        print("=" * 60)
+        return 1
+    finally:
+        await get_engine().dispose()
+
+    print("\n" + "=" * 60)
+    print("✅ Done")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grant or revoke admin rights")
+    parser.add_argument("email", help="email of an existing user")
+    parser.add_argument("--revoke", action="store_true", help="remove admin rights instead")
+
+    exit_code = asyncio.run(main(parser.parse_args()))
+    sys.exit(exit_code)